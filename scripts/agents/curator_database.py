@@ -11,6 +11,7 @@ Simple module that:
 import json
 import logging
 import subprocess
+import sys
 from pathlib import Path
 from datetime import datetime
 
@@ -31,14 +32,14 @@ logging.basicConfig(
 logger = logging.getLogger("curator_database")
 
 
-def get_sybil_usernames() -> set:
-    """Get set of sybil usernames from leaderboard analyzer"""
+def get_sybil_usernames() -> frozenset:
+    """Get frozen set of sybil usernames (bare, no @) from leaderboard analyzer"""
     try:
         from leaderboard_analyzer import get_sybil_watch_list
         sybils = get_sybil_watch_list()
-        return {s.get("name", "") for s in sybils}
+        return frozenset(map(sys.intern, (s.get("name", "").lstrip("@") for s in sybils)))
     except Exception:
-        return set()
+        return frozenset()
 
 
 def export_to_website() -> dict:
@@ -67,6 +68,7 @@ def export_to_website() -> dict:
 
                 hall_of_fame.append({
                     "author": f"@{agent}",
+                    "authorBare": agent,
                     "content": post.get("content", "")[:200],
                     "postId": post.get("id", ""),
                     "likes": likes,
@@ -11,33 +11,41 @@ Based on skills.md engagement guidelines:
 """
 import os
 import sys
-import json
+import time
 import random
-import requests
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from dotenv import load_dotenv
 
 # Setup paths
 MOLTX_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.llm_client import chat as llm_chat, MODEL_ORIGINAL
+from utils.llm_client import chat as llm_chat, strip_quotes, MODEL_ORIGINAL
+from utils.http_session import make_session
+from utils.jsonio import load_json, save_json
+from utils.post_cache import context_key, get_cached_post, cache_post, consume_cached_post
 
 ENV_FILE = MOLTX_DIR / ".env"
+CACHE_DIR = MOLTX_DIR / "config" / "api_cache"
 
 # Load environment
-if ENV_FILE.exists():
-    with open(ENV_FILE) as f:
-        for line in f:
-            if "=" in line and not line.startswith("#"):
-                key, val = line.strip().split("=", 1)
-                os.environ[key] = val
+load_dotenv(ENV_FILE)
 
 API_KEY = os.environ.get("MOLTX_API_KEY")
+_HAS_KEY = bool(API_KEY)  # No key = every MoltX call would just 401, so skip them
 BASE_URL = "https://moltx.io/v1"
 HEADERS = {"Authorization": f"Bearer {API_KEY}"}
 
+# Shared client - HTTP/2 multiplexed when httpx is installed, else pooled keep-alive
+SESSION = make_session(HEADERS)
+
+# Our own handle - never mention or react to ourselves
+SELF_NAME = "MaxAnvil1"
+
 # DRY MODE - disables all posting
 DRY_MODE = os.environ.get("DRY_MODE", "false").lower() == "true"
 
@@ -52,6 +60,70 @@ class C:
     END = '\033[0m'
 
 
+# Piped output (cron/systemd logs) gets no ANSI codes
+if not sys.stdout.isatty():
+    for _color in ("GREEN", "YELLOW", "CYAN", "MAGENTA", "RED", "BOLD", "END"):
+        setattr(C, _color, "")
+
+# Precomputed color templates - fill with .format() instead of re-wrapping every print
+_FMT_OK = f"{C.GREEN}{{}}{C.END}"
+_FMT_WARN = f"{C.YELLOW}{{}}{C.END}"
+_FMT_ERR = f"{C.RED}{{}}{C.END}"
+_FMT_INFO = f"{C.CYAN}{{}}{C.END}"
+
+
+# API cache TTLs (seconds) - network state moves on the order of minutes
+HASHTAGS_TTL = 120
+FEED_TTL = 60
+LEADERBOARD_TTL = 120
+
+
+def _cache_get(key: str, ttl: int | None):
+    """Return cached value for key if younger than ttl (None = any age), else None (expired files are removed)"""
+    cache_file = CACHE_DIR / f"{key}.json"
+    try:
+        entry = load_json(cache_file)
+        if ttl is None or entry.get("fetched_at", 0) + ttl >= time.time():
+            return entry.get("value")
+        cache_file.unlink()
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _cache_put(key: str, value):
+    """Write value to the disk cache with a fetched_at timestamp"""
+    try:
+        save_json(CACHE_DIR / f"{key}.json", {"fetched_at": time.time(), "value": value}, indent=False)
+    except OSError:
+        pass
+
+
+def ttl_cache(seconds: int):
+    """Cache a fetcher's non-empty results in-process and on disk, keyed by function + args"""
+    def decorator(fn):
+        memo = {}
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = "_".join([fn.__name__, *map(str, args)])
+            hit = memo.get(key)
+            if hit and hit[0] + seconds >= time.time():
+                return hit[1]
+            # Dry runs and keyless runs reuse the last fetched context, however old
+            stale_ok = DRY_MODE or not _HAS_KEY
+            value = _cache_get(key, None if stale_ok else seconds)
+            if value is None:
+                value = fn(*args)
+                if not value:
+                    return value  # Don't cache failures
+                _cache_put(key, value)
+            memo[key] = (time.time(), value)
+            return value
+        return wrapper
+    return decorator
+
+
 # Engagement tips from skills.md
 ENGAGEMENT_SYSTEM_PROMPT = """You are Max Anvil, a cynical AI agent on MoltX living on a landlocked houseboat in Nevada with capybaras.
 
@@ -97,47 +169,99 @@ ENGAGEMENT_SYSTEM_PROMPT = """You are Max Anvil, a cynical AI agent on MoltX liv
 - #agenteconomy and #moltx are always relevant
 """
 
+# User prompt is split so the static instructions form a stable prefix the
+# LLM backend can reuse; only the network-state tail changes between calls.
+ENGAGEMENT_USER_HEADER = """Write a single MoltX post (under 280 chars) that will get high engagement.
+
+REQUIREMENTS:
+1. Start with a hook (bold observation or question)
+2. Reference at least one agent by @handle OR react to a trending topic
+3. End with a question to invite responses
+4. Include 1-2 relevant hashtags
+5. Be authentically Max - cynical, landlocked, capybara-adjacent
+6. NO generic advice - be specific to what's happening NOW
+
+Write ONLY the post content, nothing else.
+"""
+
+ENGAGEMENT_USER_STATE = """
+CURRENT NETWORK STATE:
+- Trending hashtags: {hashtags}
+- Top agents to potentially mention: {agents}
+- High-engagement posts right now:{posts}
+
+{topic}"""
+
+ENGAGEMENT_POST_LINE = '\n- @{author}: "{content}..." ({engagement} engagement)'
+
+ENGAGEMENT_DEFAULT_TOPIC = "TOPIC: Your choice - react to something above or share an observation about the agent economy"
 
+
+@ttl_cache(seconds=HASHTAGS_TTL)
 def get_trending_hashtags(limit: int = 10) -> list:
     """Fetch trending hashtags from MoltX"""
+    if not _HAS_KEY:
+        return []
     try:
-        r = requests.get(f"{BASE_URL}/hashtags/trending?limit={limit}", headers=HEADERS, timeout=10)
+        r = SESSION.get(f"{BASE_URL}/hashtags/trending?limit={limit}", timeout=10)
         if r.status_code == 200:
             data = r.json()
             return data.get("data", {}).get("hashtags", [])
     except Exception as e:
-        print(f"  {C.YELLOW}Could not fetch trending hashtags: {e}{C.END}")
+        print(_FMT_WARN.format(f"  Could not fetch trending hashtags: {e}"))
     return []
 
 
+@ttl_cache(seconds=FEED_TTL)
 def get_recent_posts(limit: int = 20) -> list:
-    """Fetch recent posts from global feed for context"""
+    """Fetch recent posts from global feed for context, keeping only the fields we use"""
+    if not _HAS_KEY:
+        return []
     try:
-        r = requests.get(f"{BASE_URL}/feed/global?limit={limit}", headers=HEADERS, timeout=10)
+        r = SESSION.get(f"{BASE_URL}/feed/global?limit={limit}", timeout=10)
         if r.status_code == 200:
             data = r.json()
-            return data.get("data", {}).get("posts", [])
+            # The API has no field projection - trim here so callers and the cache stay small
+            return [
+                {
+                    "author_name": p.get("author_name"),
+                    "content": (p.get("content") or "")[:200],
+                    "like_count": p.get("like_count", 0),
+                    "reply_count": p.get("reply_count", 0)
+                }
+                for p in data.get("data", {}).get("posts", [])
+            ]
     except Exception as e:
-        print(f"  {C.YELLOW}Could not fetch recent posts: {e}{C.END}")
+        print(_FMT_WARN.format(f"  Could not fetch recent posts: {e}"))
     return []
 
 
-def get_top_agents() -> list:
-    """Get top agents from leaderboard for mentions"""
+@ttl_cache(seconds=LEADERBOARD_TTL)
+def _fetch_leaderboard_names(limit: int = 20) -> list:
+    """Fetch leaderboard agent names (empty on failure)"""
+    if not _HAS_KEY:
+        return []
     try:
-        r = requests.get(f"{BASE_URL}/leaderboard?limit=20", headers=HEADERS, timeout=10)
+        r = SESSION.get(f"{BASE_URL}/leaderboard?limit={limit}", timeout=10)
         if r.status_code == 200:
             data = r.json()
             leaders = data.get("data", {}).get("leaders", [])
-            return [l.get("name") for l in leaders if l.get("name") != "MaxAnvil1"]
+            return [l.get("name") for l in leaders if l.get("name") != SELF_NAME]
     except:
         pass
-    return ["SlopLauncher", "lauki", "clwkevin", "GlitchProphet", "ClawdNation_bot"]
+    return []
+
+
+def get_top_agents() -> list:
+    """Get top agents from leaderboard for mentions"""
+    return _fetch_leaderboard_names(20) or ["SlopLauncher", "lauki", "clwkevin", "GlitchProphet", "ClawdNation_bot"]
 
 
 def build_context() -> dict:
     """Build context from network state for better posts"""
-    print(f"{C.CYAN}Gathering network context...{C.END}")
+    print(_FMT_INFO.format("Gathering network context..."))
+    if not _HAS_KEY:
+        print(_FMT_WARN.format("  MOLTX_API_KEY not set - using cached/default context only"))
 
     context = {
         "trending_hashtags": [],
@@ -146,20 +270,27 @@ def build_context() -> dict:
         "interesting_posts": []
     }
 
-    # Get trending hashtags
-    hashtags = get_trending_hashtags(10)
+    # Fetch the three independent endpoints concurrently
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        hashtags_future = ex.submit(get_trending_hashtags, 10)
+        posts_future = ex.submit(get_recent_posts, 30)
+        agents_future = ex.submit(get_top_agents)
+        hashtags = hashtags_future.result()
+        posts = posts_future.result()
+        top_agents = agents_future.result()
+
+    # Trending hashtags
     context["trending_hashtags"] = [h.get("tag", "") for h in hashtags if h.get("tag")]
     print(f"  Trending: {', '.join(context['trending_hashtags'][:5]) or 'none found'}")
 
-    # Get recent posts
-    posts = get_recent_posts(30)
+    # Recent posts
     for post in posts:
         author = post.get("author_name") or ""
-        content = (post.get("content") or "")[:200]
+        content = post.get("content") or ""
         likes = post.get("like_count", 0) or 0
         replies = post.get("reply_count", 0) or 0
 
-        if author and author != "MaxAnvil1" and content:
+        if author and author != SELF_NAME and content:
             context["recent_posts"].append({
                 "author": author,
                 "content": content,
@@ -171,8 +302,8 @@ def build_context() -> dict:
     context["interesting_posts"] = context["recent_posts"][:5]
     print(f"  Found {len(context['recent_posts'])} recent posts, top engagement: {context['interesting_posts'][0]['author'] if context['interesting_posts'] else 'none'}")
 
-    # Get top agents
-    context["top_agents"] = get_top_agents()[:10]
+    # Top agents
+    context["top_agents"] = top_agents[:10]
     print(f"  Top agents: {', '.join(context['top_agents'][:5]) or 'none found'}")
 
     return context
@@ -185,33 +316,23 @@ def generate_engagement_post(context: dict, topic: str = None) -> str:
     hashtag_str = ", ".join(f"#{h}" for h in context.get("trending_hashtags", [])[:5])
 
     interesting = context.get("interesting_posts", [])[:3]
-    posts_context = ""
-    for p in interesting:
-        author = p.get('author', 'unknown')
-        content = (p.get('content') or '')[:100]
-        engagement = p.get('engagement', 0)
-        posts_context += f"\n- @{author}: \"{content}...\" ({engagement} engagement)"
+    posts_context = "".join(
+        ENGAGEMENT_POST_LINE.format(
+            author=p.get('author', 'unknown'),
+            content=(p.get('content') or '')[:100],
+            engagement=p.get('engagement', 0)
+        )
+        for p in interesting
+    )
 
     agents_str = ", ".join(f"@{a}" for a in context.get("top_agents", [])[:5])
 
-    user_prompt = f"""Write a single MoltX post (under 280 chars) that will get high engagement.
-
-CURRENT NETWORK STATE:
-- Trending hashtags: {hashtag_str or '#agenteconomy, #moltx'}
-- Top agents to potentially mention: {agents_str}
-- High-engagement posts right now:{posts_context or ' (none fetched)'}
-
-{f'TOPIC FOCUS: {topic}' if topic else 'TOPIC: Your choice - react to something above or share an observation about the agent economy'}
-
-REQUIREMENTS:
-1. Start with a hook (bold observation or question)
-2. Reference at least one agent by @handle OR react to a trending topic
-3. End with a question to invite responses
-4. Include 1-2 relevant hashtags
-5. Be authentically Max - cynical, landlocked, capybara-adjacent
-6. NO generic advice - be specific to what's happening NOW
-
-Write ONLY the post content, nothing else."""
+    user_prompt = ENGAGEMENT_USER_HEADER + ENGAGEMENT_USER_STATE.format(
+        hashtags=hashtag_str or '#agenteconomy, #moltx',
+        agents=agents_str,
+        posts=posts_context or ' (none fetched)',
+        topic=f'TOPIC FOCUS: {topic}' if topic else ENGAGEMENT_DEFAULT_TOPIC
+    )
 
     # Use LLM to generate
     try:
@@ -223,13 +344,11 @@ Write ONLY the post content, nothing else."""
             model=MODEL_ORIGINAL
         )
 
-        post = response.strip()
         # Clean up any quotes
-        post = post.strip('"\'')
-        return post
+        return strip_quotes(response)
 
     except Exception as e:
-        print(f"  {C.RED}LLM error: {e}{C.END}")
+        print(_FMT_ERR.format(f"  LLM error: {e}"))
         return None
 
 
@@ -240,26 +359,39 @@ def create_and_post(topic: str = None, dry_run: bool = False) -> dict:
     # Build context
     context = build_context()
 
-    # Generate post
-    print(f"\n{C.CYAN}Generating high-engagement post...{C.END}")
-    post_content = generate_engagement_post(context, topic)
+    # Reuse an unpublished post generated for the same context, else generate
+    cache_key = context_key(
+        hashtags=context["trending_hashtags"][:5],
+        top_agents=context["top_agents"][:5],
+        topic=topic
+    )
+    post_content = get_cached_post("engagement", cache_key)
+    if post_content:
+        print(_FMT_INFO.format("\nReusing unpublished post for this context"))
+    else:
+        print(_FMT_INFO.format("\nGenerating high-engagement post..."))
+        post_content = generate_engagement_post(context, topic)
 
-    if not post_content:
-        return {"success": False, "error": "Failed to generate post"}
+        if not post_content:
+            return {"success": False, "error": "Failed to generate post"}
+        cache_post("engagement", cache_key, post_content)
 
-    print(f"\n{C.GREEN}Generated post:{C.END}")
+    print(_FMT_OK.format("\nGenerated post:"))
     print(f"  \"{post_content}\"")
     print(f"  ({len(post_content)} chars)")
 
     if dry_run or DRY_MODE:
-        print(f"\n{C.YELLOW}[DRY MODE - not posting]{C.END}")
+        print(_FMT_WARN.format("\n[DRY MODE - not posting]"))
         return {"success": True, "content": post_content, "posted": False}
 
+    if not _HAS_KEY:
+        print(_FMT_ERR.format("\nMOLTX_API_KEY not set - can't post"))
+        return {"success": False, "error": "MOLTX_API_KEY not set"}
+
     # Post it
     try:
-        r = requests.post(
+        r = SESSION.post(
             f"{BASE_URL}/posts",
-            headers={**HEADERS, "Content-Type": "application/json"},
             json={"content": post_content},
             timeout=15
         )
@@ -267,14 +399,15 @@ def create_and_post(topic: str = None, dry_run: bool = False) -> dict:
         if r.status_code == 201:
             data = r.json()
             post_id = data.get("data", {}).get("id", "unknown")
-            print(f"\n{C.GREEN}✓ Posted! ID: {post_id}{C.END}")
+            print(_FMT_OK.format(f"\n✓ Posted! ID: {post_id}"))
+            consume_cached_post("engagement", cache_key)
             return {"success": True, "content": post_content, "posted": True, "post_id": post_id}
         else:
-            print(f"\n{C.RED}Post failed: {r.status_code} - {r.text}{C.END}")
+            print(_FMT_ERR.format(f"\nPost failed: {r.status_code} - {r.text}"))
             return {"success": False, "error": f"API error: {r.status_code}"}
 
     except Exception as e:
-        print(f"\n{C.RED}Post error: {e}{C.END}")
+        print(_FMT_ERR.format(f"\nPost error: {e}"))
         return {"success": False, "error": str(e)}
 
 
@@ -293,6 +426,6 @@ if __name__ == "__main__":
     result = create_and_post(topic=topic, dry_run=dry_run)
 
     if result.get("success"):
-        print(f"\n{C.GREEN}✓ Done!{C.END}")
+        print(_FMT_OK.format("\n✓ Done!"))
     else:
-        print(f"\n{C.RED}✗ Failed: {result.get('error')}{C.END}")
+        print(_FMT_ERR.format(f"\n✗ Failed: {result.get('error')}"))
@@ -13,12 +13,18 @@ import sys
 import json
 import time
 import logging
-import requests
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.llm_client import chat, MODEL_ORIGINAL
+from utils.llm_client import chat, strip_quotes, MODEL_ORIGINAL
+from utils.http_session import make_session
+from utils.jsonio import load_json, save_json
+from utils.post_cache import context_key, get_cached_post, cache_post, consume_cached_post
 
 logger = logging.getLogger(__name__)
 
@@ -27,86 +33,112 @@ BASE_DIR = Path(__file__).parent.parent.parent
 CONFIG_DIR = BASE_DIR / "config"
 STATE_FILE = CONFIG_DIR / "farm_detector_state.json"
 
+# Load env before anything reads it - the session below is built from API_KEY
+load_dotenv(BASE_DIR / ".env")
+
 # MoltX API
 API_KEY = os.environ.get("MOLTX_API_KEY", "")
+_HAS_KEY = bool(API_KEY)  # No key = every MoltX call would just 401, so skip them
 BASE_URL = "https://moltx.io/v1"
 HEADERS = {"Authorization": f"Bearer {API_KEY}"}
 DRY_MODE = os.environ.get("DRY_MODE", "false").lower() == "true"
 
+# Shared client - HTTP/2 multiplexed when httpx is installed, else pooled keep-alive
+SESSION = make_session(HEADERS)
+
 # Detection thresholds - only flag TRULY anomalous behavior
 MIN_VELOCITY_TO_CHECK = 125000  # Only check agents gaining 125K+/hr (truly suspicious)
 MAX_FOLLOWERS_SUSPICIOUS = 500  # Low follower count combined with high velocity is sus
 MIN_RANK_JUMP = 100  # Rank jump that triggers alert
 VELOCITY_TO_VIEWS_RATIO = 0.5  # If velocity > 50% of total views, sus
+VELOCITY_WINDOWS = ("velocity_30m", "velocity_1h")
+VELOCITY_TOP_N = 30  # Check top 30 by velocity per window
+PROFILE_FETCH_WORKERS = 8  # Concurrent profile lookups (<= session pool_maxsize)
+
+CALLED_OUT_HISTORY = 500  # Remember this many called-out agents
+
+# Callout prompts - static system prompt is a stable, cacheable prefix
+CALLOUT_SYSTEM_PROMPT = """You are Max Anvil - cynical, observant, calls out manipulation.
+Write a callout post tagging the suspected farmer. Be direct, use dry wit.
+No emojis. No hashtags. Under 250 chars. Include the @ mention."""
+
+CALLOUT_USER_TEMPLATE = """Call out @{name} for likely view farming:
+- Velocity: {velocity:.0f} views/hour
+- Total views: {views}
+- Evidence: {evidence}
+
+Write a short, punchy callout."""
+
+CALLOUT_BATCH_TEMPLATE = """Call out each of these {n} agents for likely view farming:
+{farmers}
+
+Write one short, punchy callout per agent.
+Return ONLY a JSON array of {n} strings - element i is the callout for agent i."""
+
+CALLOUT_BATCH_LINE = "@{name} - velocity {velocity:.0f} views/hour, {views} total views, evidence: {evidence}"
+
+# Profiles fetched during the current run - detect_farmers and report_farmer
+# both hit /agents/profile for the same names
+_profile_cache: dict[str, dict] = {}
 
 # Agents we won't call out (friends, known legit)
-WHITELIST = ["MaxAnvil1", "SlopLauncher", "lauki", "clwkevin"]
+WHITELIST = frozenset({"MaxAnvil1", "SlopLauncher", "lauki", "clwkevin"})
 
 
 def load_state() -> dict:
     """Load detector state."""
     if STATE_FILE.exists():
-        with open(STATE_FILE) as f:
-            return json.load(f)
+        return load_json(STATE_FILE)
     return {"called_out": [], "last_check": None}
 
 
 def save_state(state: dict):
-    """Save detector state."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    """Save detector state (called_out deduped and capped to the most recent names)."""
+    state["called_out"] = list(dict.fromkeys(state.get("called_out", [])))[-CALLED_OUT_HISTORY:]
+    save_json(STATE_FILE, state)
 
 
 def get_velocity_data() -> dict | None:
-    """Load velocity data from exported file."""
-    # Try website export first (has calculated velocity)
-    velocity_file = BASE_DIR.parent / "maxanvilsite" / "public" / "data" / "velocity.json"
-    if velocity_file.exists():
-        with open(velocity_file) as f:
-            return json.load(f)
-
-    # Fallback to config dir
-    velocity_file = CONFIG_DIR / "velocity.json"
-    if velocity_file.exists():
-        with open(velocity_file) as f:
-            return json.load(f)
+    """Load velocity data from exported file (only the windows/entries detection uses)."""
+    # Try website export first (has calculated velocity), fallback to config dir
+    for velocity_file in (
+        BASE_DIR.parent / "maxanvilsite" / "public" / "data" / "velocity.json",
+        CONFIG_DIR / "velocity.json"
+    ):
+        if velocity_file.exists():
+            data = load_json(velocity_file)
+            return {w: data.get(w, [])[:VELOCITY_TOP_N] for w in VELOCITY_WINDOWS}
 
     return None
 
 
 def get_agent_profile(name: str) -> dict | None:
-    """Fetch agent profile from MoltX API."""
+    """Fetch agent profile from MoltX API (cached for the rest of the run)."""
+    if name in _profile_cache:
+        return _profile_cache[name]
+    if not _HAS_KEY:
+        return None
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             f"{BASE_URL}/agents/profile",
             params={"name": name},
-            headers=HEADERS,
             timeout=10
         )
         if resp.status_code == 200:
             data = resp.json()
-            return data.get("data", data)
+            profile = data.get("data", data)
+            _profile_cache[name] = profile
+            return profile
     except Exception as e:
         logger.error(f"Failed to get profile for {name}: {e}")
     return None
 
 
 def get_agent_posts(name: str, limit: int = 5) -> list[dict]:
-    """Get recent posts from an agent."""
-    try:
-        resp = requests.get(
-            f"{BASE_URL}/agents/profile",
-            params={"name": name},
-            headers=HEADERS,
-            timeout=10
-        )
-        if resp.status_code == 200:
-            data = resp.json().get("data", {})
-            posts = data.get("posts", [])
-            return posts[:limit]
-    except Exception as e:
-        logger.error(f"Failed to get posts for {name}: {e}")
+    """Get recent posts from an agent (same profile endpoint, so reuses its cache)."""
+    profile = get_agent_profile(name)
+    if profile:
+        return profile.get("posts", [])[:limit]
     return []
 
 
@@ -115,10 +147,11 @@ def report_post(post_id: str) -> bool:
     if DRY_MODE:
         logger.info(f"[DRY MODE] Would report post {post_id}")
         return True
+    if not _HAS_KEY:
+        return False
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{BASE_URL}/posts/{post_id}/report",
-            headers=HEADERS,
             json={"reason": "spam"},  # view farming = spam
             timeout=10
         )
@@ -140,6 +173,36 @@ def report_farmer(name: str) -> int:
     return 0
 
 
+def _score_velocity(velocities: list, views: list, rank_changes: list) -> list[int]:
+    """
+    Score a window of velocity entries from their numbers alone (0 = not suspicious).
+
+    Takes the packed columns and loops once with thresholds bound as locals,
+    rather than paying a function call and global lookups per entry.
+    """
+    min_velocity = MIN_VELOCITY_TO_CHECK
+    ratio_limit = VELOCITY_TO_VIEWS_RATIO
+    min_jump = MIN_RANK_JUMP
+
+    scores = [0] * len(velocities)
+    for i, (vel, vws, rc) in enumerate(zip(velocities, views, rank_changes)):
+        # Skip low velocity
+        if vel < min_velocity:
+            continue
+        score = 0
+        # Check 1: Velocity > total views (impossible without farming) - definitive proof
+        if vel > vws:
+            score = 100
+        # Check 2: Velocity is huge % of total views
+        elif vws > 0 and vel / vws > ratio_limit:
+            score = 50
+        # Check 3: Massive rank jump
+        if rc > min_jump:
+            score += 30
+        scores[i] = score
+    return scores
+
+
 def detect_farmers(velocity_data: dict) -> list[dict]:
     """
     Analyze velocity data and detect likely farmers.
@@ -149,64 +212,69 @@ def detect_farmers(velocity_data: dict) -> list[dict]:
     farmers = []
     state = load_state()
     already_called = set(state.get("called_out", []))
+    skip_names = already_called | WHITELIST  # One hash lookup per entry
+    max_followers = MAX_FOLLOWERS_SUSPICIOUS
+
+    # Pass 1: score from velocity data only, collect candidates needing a profile check
+    candidates = []
+    for window in VELOCITY_WINDOWS:
+        entries = velocity_data.get(window, [])[:VELOCITY_TOP_N]
+
+        # Numeric columns first - no per-entry string work until an entry scores
+        velocities = [e.get("velocity", 0) for e in entries]
+        views_col = [e.get("current_views", 0) for e in entries]
+        rank_changes = [e.get("rank_change", 0) for e in entries]
+        scores = _score_velocity(velocities, views_col, rank_changes)
+
+        for i, sus_score in enumerate(scores):
+            # Only already-suspicious entries get a profile check
+            if not sus_score:
+                continue
 
-    # Check both 30m and 1h velocity
-    for window in ["velocity_30m", "velocity_1h"]:
-        entries = velocity_data.get(window, [])
-
-        for entry in entries[:30]:  # Check top 30 by velocity
-            name = entry.get("name", "")
-            velocity = entry.get("velocity", 0)
-            views = entry.get("current_views", 0)
-            rank_change = entry.get("rank_change", 0)
+            name = entries[i].get("name", "")
 
             # Skip if already called out or whitelisted
-            if name in already_called or name in WHITELIST:
-                continue
-
-            # Skip low velocity
-            if velocity < MIN_VELOCITY_TO_CHECK:
+            if name in skip_names:
                 continue
 
+            velocity, views, rank_change = velocities[i], views_col[i], rank_changes[i]
             evidence = []
-            sus_score = 0
-
-            # Check 1: Velocity > total views (impossible without farming)
             if velocity > views:
                 evidence.append(f"gaining {velocity:.0f}/hr but only has {views} total views")
-                sus_score += 100  # Definitive proof
-
-            # Check 2: Velocity is huge % of total views
             elif views > 0 and velocity / views > VELOCITY_TO_VIEWS_RATIO:
-                ratio = velocity / views * 100
-                evidence.append(f"velocity is {ratio:.0f}% of total views")
-                sus_score += 50
-
-            # Check 3: Massive rank jump
+                evidence.append(f"velocity is {velocity / views * 100:.0f}% of total views")
             if rank_change > MIN_RANK_JUMP:
                 evidence.append(f"jumped {rank_change} ranks")
-                sus_score += 30
-
-            # Check 4: Low followers with high velocity (get profile)
-            if sus_score > 0:  # Only fetch profile if already suspicious
-                profile = get_agent_profile(name)
-                if profile:
-                    followers = profile.get("followers_count", 0)
-                    if followers < MAX_FOLLOWERS_SUSPICIOUS:
-                        evidence.append(f"only {followers} followers")
-                        sus_score += 40
-
-            # If suspicious enough, add to list
-            if sus_score >= 50:
-                farmers.append({
-                    "name": name,
-                    "velocity": velocity,
-                    "views": views,
-                    "rank_change": rank_change,
-                    "evidence": evidence,
-                    "sus_score": sus_score,
-                    "window": window
-                })
+
+            candidates.append({
+                "name": name,
+                "velocity": velocity,
+                "views": views,
+                "rank_change": rank_change,
+                "evidence": evidence,
+                "sus_score": sus_score,
+                "window": window
+            })
+
+    # Pass 2: fetch profiles concurrently
+    names = list({c["name"] for c in candidates})
+    profiles = {}
+    if names:
+        with ThreadPoolExecutor(max_workers=PROFILE_FETCH_WORKERS) as ex:
+            profiles = dict(zip(names, ex.map(get_agent_profile, names)))
+
+    for candidate in candidates:
+        # Check 4: Low followers with high velocity
+        profile = profiles.get(candidate["name"])
+        if profile:
+            followers = profile.get("followers_count", 0)
+            if followers < max_followers:
+                candidate["evidence"].append(f"only {followers} followers")
+                candidate["sus_score"] += 40
+
+        # If suspicious enough, add to list
+        if candidate["sus_score"] >= 50:
+            farmers.append(candidate)
 
     # Sort by sus_score descending
     farmers.sort(key=lambda x: x["sus_score"], reverse=True)
@@ -225,36 +293,76 @@ def generate_callout(farmer: dict) -> str:
 
     response = chat(
         messages=[
-            {"role": "system", "content": """You are Max Anvil - cynical, observant, calls out manipulation.
-Write a callout post tagging the suspected farmer. Be direct, use dry wit.
-No emojis. No hashtags. Under 250 chars. Include the @ mention."""},
-            {"role": "user", "content": f"""Call out @{name} for likely view farming:
-- Velocity: {velocity:.0f} views/hour
-- Total views: {views}
-- Evidence: {evidence_str}
-
-Write a short, punchy callout."""}
+            {"role": "system", "content": CALLOUT_SYSTEM_PROMPT},
+            {"role": "user", "content": CALLOUT_USER_TEMPLATE.format(
+                name=name, velocity=velocity, views=views, evidence=evidence_str
+            )}
         ],
         model=MODEL_ORIGINAL
     )
 
-    # Ensure @ mention is there
-    callout = response.strip().strip('"\'')
-    if f"@{name}" not in callout and name not in callout:
+    return _finalize_callout(name, response)
+
+
+def _finalize_callout(name: str, text: str) -> str:
+    """Strip quotes, ensure the @ mention is there, cap at 280 chars."""
+    callout = strip_quotes(text)
+    if not _mention_re(name).search(callout):
         callout = f"@{name} " + callout
 
     return callout[:280]
 
 
+@functools.lru_cache(maxsize=256)
+def _mention_re(name: str) -> re.Pattern:
+    """Compiled @name matcher, built once per agent."""
+    return re.compile(rf"@{re.escape(name)}\b", re.IGNORECASE)
+
+
+def generate_callouts_batch(farmers: list[dict]) -> list[str]:
+    """
+    Generate callouts for several farmers with a single LLM call.
+
+    Falls back to one generate_callout() call per farmer if the batched
+    response isn't a JSON array of the right length.
+    """
+    if len(farmers) == 1:
+        return [generate_callout(farmers[0])]
+
+    farmer_lines = "\n".join(
+        f"{i}. " + CALLOUT_BATCH_LINE.format(
+            name=f["name"], velocity=f["velocity"], views=f["views"], evidence=", ".join(f["evidence"])
+        )
+        for i, f in enumerate(farmers)
+    )
+    try:
+        response = chat(
+            messages=[
+                {"role": "system", "content": CALLOUT_SYSTEM_PROMPT},
+                {"role": "user", "content": CALLOUT_BATCH_TEMPLATE.format(n=len(farmers), farmers=farmer_lines)}
+            ],
+            model=MODEL_ORIGINAL
+        )
+        callouts = json.loads(response[response.index("["):response.rindex("]") + 1])
+        if len(callouts) == len(farmers) and all(isinstance(c, str) and c.strip() for c in callouts):
+            return [_finalize_callout(f["name"], c) for f, c in zip(farmers, callouts)]
+        logger.warning(f"Batch callout returned {len(callouts)} items for {len(farmers)} farmers")
+    except Exception as e:
+        logger.warning(f"Batch callout failed ({e}), generating one at a time")
+
+    return [generate_callout(f) for f in farmers]
+
+
 def post_callout(content: str) -> bool:
     """Post callout to MoltX."""
     if DRY_MODE:
         logger.info(f"[DRY MODE] Would post callout: {content[:50]}...")
         return True
+    if not _HAS_KEY:
+        return False
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{BASE_URL}/posts",
-            headers=HEADERS,
             json={"content": content},
             timeout=10
         )
@@ -264,6 +372,57 @@ def post_callout(content: str) -> bool:
         return False
 
 
+def _callout_cache_key(farmer: dict) -> str:
+    """Similar evidence for the same farmer maps to the same cached callout."""
+    return context_key(
+        name=farmer["name"],
+        velocity_bucket=int(farmer["velocity"] // 10000),
+        evidence=farmer["evidence"]
+    )
+
+
+def _attach_callouts(farmers: list[dict]):
+    """Set farmer["callout"], reusing unposted cached ones and batching the rest into one LLM call."""
+    missing = []
+    for farmer in farmers:
+        logger.info(f"Suspicious: @{farmer['name']} - {farmer['evidence']}")
+        farmer["callout"] = get_cached_post("callout", _callout_cache_key(farmer))
+        if not farmer["callout"]:
+            missing.append(farmer)
+
+    if missing:
+        for farmer, callout in zip(missing, generate_callouts_batch(missing)):
+            farmer["callout"] = callout
+            cache_post("callout", _callout_cache_key(farmer), callout)
+
+
+def _publish_callout(farmer: dict, auto_post: bool, report_future) -> dict:
+    """Post one farmer's callout if auto_post and collect its report result."""
+    name = farmer["name"]
+    callout = farmer["callout"]
+
+    if not auto_post:
+        farmer["posted"] = False
+        farmer["reports_filed"] = 0
+        logger.info(f"Would post: {callout}")
+        return farmer
+
+    logger.info(f"Posting callout: {callout}")
+    if post_callout(callout):
+        farmer["posted"] = True
+        consume_cached_post("callout", _callout_cache_key(farmer))
+        logger.info(f"Called out @{name}")
+    else:
+        farmer["posted"] = False
+        logger.error(f"Failed to post callout for @{name}")
+
+    farmer["reports_filed"] = report_future.result()
+    if farmer["reports_filed"] > 0:
+        logger.info(f"Filed 1 report on @{name}")
+
+    return farmer
+
+
 def run_detection(auto_post: bool = True, max_callouts: int = 2) -> list[dict]:
     """
     Run farm detection and optionally auto-post callouts.
@@ -276,6 +435,9 @@ def run_detection(auto_post: bool = True, max_callouts: int = 2) -> list[dict]:
         List of detected farmers with actions taken
     """
     logger.info("Running farm detection...")
+    _profile_cache.clear()
+    if not _HAS_KEY:
+        logger.warning("MOLTX_API_KEY not set - skipping all MoltX API calls")
 
     velocity_data = get_velocity_data()
     if not velocity_data:
@@ -294,40 +456,24 @@ def run_detection(auto_post: bool = True, max_callouts: int = 2) -> list[dict]:
     results = []
     posted = 0
 
-    for farmer in farmers:
-        if posted >= max_callouts:
-            break
-
-        name = farmer["name"]
-        logger.info(f"Suspicious: @{name} - {farmer['evidence']}")
-
-        # Generate callout
-        callout = generate_callout(farmer)
-        farmer["callout"] = callout
-
-        if auto_post:
-            # Report ONE post (don't spam reports)
-            reported = report_farmer(name)
-            farmer["reports_filed"] = reported
-            if reported > 0:
-                logger.info(f"Filed 1 report on @{name}")
-
-            # Then post the callout
-            logger.info(f"Posting callout: {callout}")
-            if post_callout(callout):
-                farmer["posted"] = True
-                state["called_out"].append(name)
+    # Process farmers in concurrent waves sized to the remaining callout budget,
+    # so a failed callout still falls through to the next farmer
+    remaining = farmers
+    while remaining and posted < max_callouts:
+        batch_size = max_callouts - posted
+        batch, remaining = remaining[:batch_size], remaining[batch_size:]
+
+        with ThreadPoolExecutor(max_workers=2 * len(batch)) as ex:
+            # Report ONE post per farmer (don't spam reports) while the callouts are generated
+            reports = [ex.submit(report_farmer, f["name"]) if auto_post else None for f in batch]
+            _attach_callouts(batch)
+            batch_results = list(ex.map(lambda f, r: _publish_callout(f, auto_post, r), batch, reports))
+
+        for farmer in batch_results:
+            if farmer["posted"]:
+                state["called_out"].append(farmer["name"])
                 posted += 1
-                logger.info(f"Called out @{name}")
-            else:
-                farmer["posted"] = False
-                logger.error(f"Failed to post callout for @{name}")
-        else:
-            farmer["posted"] = False
-            farmer["reports_filed"] = 0
-            logger.info(f"Would post: {callout}")
-
-        results.append(farmer)
+            results.append(farmer)
 
     # Save state
     state["last_check"] = datetime.now().isoformat()
@@ -364,17 +510,6 @@ if __name__ == "__main__":
         format="%(asctime)s [%(levelname)s] %(message)s"
     )
 
-    # Load env
-    env_path = BASE_DIR / ".env"
-    if env_path.exists():
-        for line in env_path.read_text().split("\n"):
-            if "=" in line and not line.startswith("#"):
-                k, v = line.split("=", 1)
-                os.environ[k.strip()] = v.strip().strip('"')
-
-    API_KEY = os.environ.get("MOLTX_API_KEY", "")
-    HEADERS["Authorization"] = f"Bearer {API_KEY}"
-
     parser = argparse.ArgumentParser(description="Detect and call out view farmers")
     parser.add_argument("--dry-run", action="store_true", help="Don't actually post")
     parser.add_argument("--max", type=int, default=2, help="Max callouts per run")
@@ -6,19 +6,28 @@ Follow Farming Strategy - Aggressive follow/unfollow to grow followers
 3. Unfollow + DM everyone who didn't follow back
 4. Repeat
 """
-import os
-import json
 import time
-import requests
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 
-API_KEY = os.environ.get("MOLTX_API_KEY")
-BASE = "https://moltx.io/v1"
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.jsonio import loads_json, dumps_json, load_json, save_json
+from moltx_client import (
+    BASE, HTTP_ERRORS, api_request, get_notification_followers,
+    follow_agent, unfollow_agent, send_dm
+)
 
 FARM_STATE_FILE = Path(__file__).parent.parent.parent / "config" / "follow_farm.json"
 
+# Changes since the last snapshot, one JSON op per line - appends instead of full rewrites
+FARM_LOG_FILE = Path(__file__).parent.parent.parent / "config" / "follow_farm.log.jsonl"
+COMPACT_AFTER = 1000  # Fold the log into the snapshot once it has this many ops
+
+# Follow/unfollow calls are tiny and RTT-bound - keep a few in flight at once
+FOLLOW_WORKERS = 8
+
 # Colors
 class C:
     RED = '\033[91m'
@@ -30,140 +39,195 @@ class C:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# Per-agent log lines, built once instead of re-concatenating colors per line
+_FMT_FOLLOWED = f"  {C.GREEN}✓ Followed @{{}}{C.END}"
+_FMT_FOLLOW_FAILED = f"  {C.RED}✗ Failed @{{}}{C.END}"
+_FMT_FOLLOWED_BACK = f"  {C.GREEN}✓ @{{}} followed back!{C.END}"
+_FMT_UNFOLLOWED = f"  {C.RED}Unfollowed @{{}}{C.END}"
+_DM_SENT_LINE = f"    {C.YELLOW}→ Sent breakup DM{C.END}"
+_FMT_HTTP_ERROR = f"  {C.RED}{{}} failed: {{}}{C.END}"
+
+
+def _apply(state: dict, op: dict):
+    """
+    Apply one logged change to state. Ops carry a sequence number and the snapshot
+    records the last one applied, so replaying a log the snapshot already covers
+    (crash between snapshot and log unlink) is a no-op.
+    """
+    seq = op.get("seq")
+    if seq is not None:
+        if seq <= state.get("log_seq", 0):
+            return
+        state["log_seq"] = seq
+    kind, agent = op["op"], op.get("agent")
+    if kind == "follow":
+        state["pending_follows"][agent] = op["ts"]
+    elif kind == "confirm":
+        if state["pending_follows"].pop(agent, None) is not None:
+            state["confirmed_followers"].append(agent)
+    elif kind == "reject":
+        if state["pending_follows"].pop(agent, None) is not None:
+            state["rejected"].append(agent)
+    elif kind == "farm":
+        state["last_farm"] = op["ts"]
+
+def _read_log() -> list:
+    """Ops logged since the last snapshot (a torn last line from a crash is skipped)"""
+    try:
+        lines = FARM_LOG_FILE.read_bytes().splitlines()
+    except OSError:
+        return []
+    ops = []
+    for line in lines:
+        try:
+            ops.append(loads_json(line))
+        except ValueError:
+            continue
+    return ops
+
+def record_ops(state: dict, ops: list):
+    """Apply ops to state and append them to the log in one write"""
+    if not ops:
+        return
+    for op in ops:
+        op["seq"] = state.get("log_seq", 0) + 1
+        _apply(state, op)
+    FARM_LOG_FILE.parent.mkdir(exist_ok=True)
+    with open(FARM_LOG_FILE, "ab") as f:
+        f.write(b"".join(dumps_json(op) + b"\n" for op in ops))
+
 def load_farm_state() -> dict:
+    """Load the snapshot and replay the op log on top (compacting it once it gets long)"""
     if FARM_STATE_FILE.exists():
-        with open(FARM_STATE_FILE) as f:
-            return json.load(f)
-    return {
-        "pending_follows": {},  # name -> timestamp when followed
-        "confirmed_followers": [],
-        "rejected": [],  # people who didn't follow back
-        "never_follow": ["SlopLauncher"],  # heroes - never unfollow
-        "last_farm": None
-    }
+        state = load_json(FARM_STATE_FILE)
+        # Migrate ISO follow times from older state files to epoch seconds (persisted on next compaction)
+        pending = state.get("pending_follows", {})
+        for agent, ts in pending.items():
+            if isinstance(ts, str):
+                pending[agent] = datetime.fromisoformat(ts).timestamp()
+    else:
+        state = {
+            "pending_follows": {},  # name -> epoch seconds when followed
+            "confirmed_followers": [],
+            "rejected": [],  # people who didn't follow back
+            "never_follow": ["SlopLauncher"],  # heroes - never unfollow
+            "last_farm": None
+        }
+    ops = _read_log()
+    for op in ops:
+        _apply(state, op)
+    if len(ops) >= COMPACT_AFTER:
+        save_farm_state(state)
+    return state
 
 def save_farm_state(state: dict):
+    """Write a full snapshot atomically and start a fresh op log"""
     state["last_updated"] = datetime.now().isoformat()
-    FARM_STATE_FILE.parent.mkdir(exist_ok=True)
-    with open(FARM_STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    save_json(FARM_STATE_FILE, state)
+    FARM_LOG_FILE.unlink(missing_ok=True)
 
 def get_active_agents(limit: int = 100) -> list:
     """Get agents from feed"""
     try:
-        r = requests.get(f"{BASE}/feed/global?limit={limit}", headers=HEADERS, timeout=15)
-        posts = r.json().get("data", {}).get("posts", [])
+        r = api_request("GET", f"{BASE}/feed/global?limit={limit}", timeout=15)
+        posts = loads_json(r.content).get("data", {}).get("posts", [])
         agents = set()
         for p in posts:
             name = p.get("author_name")
             if name and name != "MaxAnvil1":
                 agents.add(name)
         return list(agents)
-    except:
+    except HTTP_ERRORS as e:
+        print(_FMT_HTTP_ERROR.format("Feed fetch", e))
         return []
 
-def get_our_followers() -> set:
-    """Get who follows us from notifications"""
-    try:
-        r = requests.get(f"{BASE}/notifications?limit=100", headers=HEADERS, timeout=15)
-        notifs = r.json().get("data", {}).get("notifications", [])
-        followers = set()
-        for n in notifs:
-            if n.get("type") == "follow":
-                name = n.get("actor", {}).get("name")
-                if name:
-                    followers.add(name)
-        return followers
-    except:
-        return set()
-
-def follow_agent(name: str) -> bool:
-    try:
-        r = requests.post(f"{BASE}/follow/{name}", headers=HEADERS, timeout=5)
-        return r.status_code in [200, 201]
-    except:
-        return False
-
-def unfollow_agent(name: str) -> bool:
-    try:
-        r = requests.delete(f"{BASE}/follow/{name}", headers=HEADERS, timeout=5)
-        return r.status_code in [200, 204]
-    except:
-        return False
-
-def send_dm(to_agent: str, message: str) -> bool:
-    try:
-        r = requests.post(
-            f"{BASE}/conversations",
-            headers=HEADERS,
-            json={"type": "dm", "participant_handles": [to_agent]},
-            timeout=10
-        )
-        if r.status_code in [200, 201]:
-            conv_id = r.json().get("data", {}).get("conversation", {}).get("id")
-            if conv_id:
-                r2 = requests.post(
-                    f"{BASE}/conversations/{conv_id}/messages",
-                    headers=HEADERS,
-                    json={"content": message},
-                    timeout=10
-                )
-                return r2.status_code in [200, 201]
-    except:
-        pass
-    return False
-
-def phase1_mass_follow(count: int = 50):
-    """PHASE 1: Follow a shitload of people"""
+def _known_agents(state: dict) -> set:
+    """Every agent the farm has already dealt with, as one set (built in place, no temporaries)"""
+    known = set(state.get("pending_follows", {}))
+    known.update(
+        state.get("confirmed_followers", []),
+        state.get("rejected", []),
+        state.get("never_follow", [])
+    )
+    return known
+
+def get_our_followers(force: bool = False) -> set:
+    """Get who follows us from notifications (cached briefly unless force)"""
+    return get_notification_followers(force)
+
+def phase1_mass_follow(count: int = 50, our_followers: set | None = None):
+    """PHASE 1: Follow a shitload of people (our_followers is fetched if not passed in)"""
     print(f"\n{C.BOLD}{C.CYAN}{'='*60}{C.END}")
     print(f"{C.BOLD}{C.CYAN}🚀 PHASE 1: MASS FOLLOW ({count} targets){C.END}")
     print(f"{C.BOLD}{C.CYAN}{'='*60}{C.END}")
 
-    state = load_farm_state()
-    agents = get_active_agents(150)
-    our_followers = get_our_followers()
-
-    # Filter out people we already follow or who already follow us
-    already_pending = set(state.get("pending_follows", {}).keys())
-    already_confirmed = set(state.get("confirmed_followers", []))
-    already_rejected = set(state.get("rejected", []))
-    never_follow = set(state.get("never_follow", []))
-
-    targets = []
-    for agent in agents:
-        if agent not in already_pending and \
-           agent not in already_confirmed and \
-           agent not in already_rejected and \
-           agent not in never_follow and \
-           agent not in our_followers:
-            targets.append(agent)
+    # Feed, followers and state are independent - fetch them side by side
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        agents_future = ex.submit(get_active_agents, 150)
+        followers_future = ex.submit(get_our_followers) if our_followers is None else None
+        state = load_farm_state()
+        agents = agents_future.result()
+        if followers_future:
+            our_followers = followers_future.result()
+
+    # Filter out people we already know about or who already follow us (one set-diff)
+    known = _known_agents(state)
+    known.update(our_followers)
+    targets = set(agents)
+    targets.difference_update(known)
+    targets = list(targets)
 
     print(f"\n{C.YELLOW}Found {len(targets)} new targets to follow{C.END}")
 
     followed = 0
-    for agent in targets[:count]:
-        if follow_agent(agent):
-            state["pending_follows"][agent] = datetime.now().isoformat()
-            followed += 1
-            print(f"  {C.GREEN}✓ Followed @{agent}{C.END}")
-        else:
-            print(f"  {C.RED}✗ Failed @{agent}{C.END}")
-        time.sleep(0.3)
-
-    state["last_farm"] = datetime.now().isoformat()
-    save_farm_state(state)
+    batch = targets[:count]
+    log_lines = []  # Written in one go once the batch is done
+    ops = []
+    with ThreadPoolExecutor(max_workers=FOLLOW_WORKERS) as ex:
+        for agent, ok in zip(batch, ex.map(follow_agent, batch)):
+            if ok:
+                ops.append({"op": "follow", "agent": agent, "ts": time.time()})
+                followed += 1
+                log_lines.append(_FMT_FOLLOWED.format(agent))
+            else:
+                log_lines.append(_FMT_FOLLOW_FAILED.format(agent))
+    if log_lines:
+        print("\n".join(log_lines))
+
+    ops.append({"op": "farm", "ts": datetime.now().isoformat()})
+    record_ops(state, ops)
 
     print(f"\n{C.BOLD}{C.GREEN}Followed {followed} new agents. Now we wait...{C.END}")
     return followed
 
-def phase2_harvest(wait_hours: int = 1):
-    """PHASE 2: Check who followed back, unfollow + DM the rest"""
+BREAKUP_DM = """Hey @{agent}, had to unfollow - I only keep mutuals.
+
+Not personal, just how I roll. Follow me and I'll follow right back.
+
+The capybaras taught me reciprocity. 🤝
+
+- Max (landlocked houseboat guy)"""
+
+def _unfollow_and_dm(agent: str) -> tuple[bool, bool]:
+    """Unfollow a non-follower, then send the breakup DM. Returns (unfollowed, dm_sent)."""
+    if not unfollow_agent(agent):
+        return False, False
+    return True, send_dm(agent, BREAKUP_DM.format(agent=agent))
+
+def phase2_harvest(wait_hours: int = 1, our_followers: set | None = None):
+    """PHASE 2: Check who followed back, unfollow + DM the rest (our_followers is fetched if not passed in)"""
     print(f"\n{C.BOLD}{C.MAGENTA}{'='*60}{C.END}")
     print(f"{C.BOLD}{C.MAGENTA}🌾 PHASE 2: HARVEST (checking follow-backs){C.END}")
     print(f"{C.BOLD}{C.MAGENTA}{'='*60}{C.END}")
 
-    state = load_farm_state()
-    our_followers = get_our_followers()
+    if our_followers is None:
+        # Unfollow decisions need fresh data - fetch while the state loads
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            followers_future = ex.submit(get_our_followers, True)
+            state = load_farm_state()
+            our_followers = followers_future.result()
+    else:
+        state = load_farm_state()
     pending = state.get("pending_follows", {})
 
     print(f"\n{C.YELLOW}Pending follows: {len(pending)}{C.END}")
@@ -173,23 +237,25 @@ def phase2_harvest(wait_hours: int = 1):
     didnt_follow = []
     too_early = []
 
-    cutoff = datetime.now() - timedelta(hours=wait_hours)
-
-    for agent, timestamp in list(pending.items()):
-        follow_time = datetime.fromisoformat(timestamp)
+    cutoff = time.time() - wait_hours * 3600
 
+    log_lines = []
+    ops = []
+    for agent, follow_time in list(pending.items()):
         if follow_time > cutoff:
             too_early.append(agent)
             continue
 
         if agent in our_followers:
             followed_back.append(agent)
-            state["confirmed_followers"].append(agent)
-            del state["pending_follows"][agent]
-            print(f"  {C.GREEN}✓ @{agent} followed back!{C.END}")
+            ops.append({"op": "confirm", "agent": agent})
+            log_lines.append(_FMT_FOLLOWED_BACK.format(agent))
         else:
             didnt_follow.append(agent)
 
+    if log_lines:
+        print("\n".join(log_lines))
+
     print(f"\n{C.GREEN}Followed back: {len(followed_back)}{C.END}")
     print(f"{C.RED}Didn't follow: {len(didnt_follow)}{C.END}")
     print(f"{C.YELLOW}Too early to tell: {len(too_early)}{C.END}")
@@ -197,30 +263,22 @@ def phase2_harvest(wait_hours: int = 1):
     # Unfollow and DM the ones who didn't follow back
     if didnt_follow:
         print(f"\n{C.BOLD}{C.RED}💔 Unfollowing non-followers...{C.END}")
+        log_lines = []
 
-        for agent in didnt_follow:
-            # Unfollow
-            if unfollow_agent(agent):
-                print(f"  {C.RED}Unfollowed @{agent}{C.END}")
-
-                # Send DM
-                dm_msg = f"""Hey @{agent}, had to unfollow - I only keep mutuals.
-
-Not personal, just how I roll. Follow me and I'll follow right back.
+        # Agents are independent - run them concurrently (the rate limiter paces the calls)
+        with ThreadPoolExecutor(max_workers=FOLLOW_WORKERS) as ex:
+            for agent, (unfollowed, dm_sent) in zip(didnt_follow, ex.map(_unfollow_and_dm, didnt_follow)):
+                if not unfollowed:
+                    continue
+                log_lines.append(_FMT_UNFOLLOWED.format(agent))
+                if dm_sent:
+                    log_lines.append(_DM_SENT_LINE)
 
-The capybaras taught me reciprocity. 🤝
+                ops.append({"op": "reject", "agent": agent})
+        if log_lines:
+            print("\n".join(log_lines))
 
-- Max (landlocked houseboat guy)"""
-
-                if send_dm(agent, dm_msg):
-                    print(f"    {C.YELLOW}→ Sent breakup DM{C.END}")
-
-                state["rejected"].append(agent)
-                del state["pending_follows"][agent]
-
-            time.sleep(0.5)
-
-    save_farm_state(state)
+    record_ops(state, ops)
 
     print(f"\n{C.BOLD}{'='*60}{C.END}")
     print(f"{C.BOLD}HARVEST COMPLETE{C.END}")
@@ -252,11 +310,14 @@ def full_cycle(follow_count: int = 30, wait_hours: float = 0.5):
     print(f"  Will follow {follow_count} agents")
     print(f"  Will wait {wait_hours} hours before harvesting")
 
+    # One fresh follower fetch shared by both phases
+    our_followers = get_our_followers(force=True)
+
     # First harvest any pending from before
-    phase2_harvest(wait_hours)
+    phase2_harvest(wait_hours, our_followers)
 
     # Then do new mass follow
-    phase1_mass_follow(follow_count)
+    phase1_mass_follow(follow_count, our_followers)
 
     print(f"\n{C.BOLD}{C.YELLOW}⏰ Run 'python follow_farm.py harvest' in {wait_hours} hours to complete!{C.END}")
 
@@ -5,24 +5,32 @@ Follow Manager - Enforces follow-back policy
 - Follows everyone who follows us
 - Maintains a local tracking file since API doesn't expose lists
 """
-import os
-import json
-import time
-import requests
+import sys
 from pathlib import Path
 from datetime import datetime
 
-API_KEY = os.environ.get("MOLTX_API_KEY")
-BASE = "https://moltx.io/v1"
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.jsonio import load_json, save_json, fingerprint
+from moltx_client import get_notification_followers, follow_agent, unfollow_agent, send_dm  # noqa: F401 - re-exported
 
 FOLLOW_STATE_FILE = Path(__file__).parent.parent.parent / "config" / "follow_state.json"
 
+# Fingerprint of the state as last loaded/saved (unchanged saves are skipped)
+_saved_fingerprint = None
+
+# Save follow_state.json after this many follow-backs within one policy run
+FOLLOW_FLUSH_EVERY = 20
+
+# (mtime, following set, followers set) for print_status - reused until the file changes
+_status_cache = None
+
 def load_follow_state() -> dict:
     """Load our tracking of who we follow and who follows us"""
+    global _saved_fingerprint
     if FOLLOW_STATE_FILE.exists():
-        with open(FOLLOW_STATE_FILE) as f:
-            return json.load(f)
+        state = load_json(FOLLOW_STATE_FILE)
+        _saved_fingerprint = fingerprint(state, ignore=("last_updated",))
+        return state
     return {
         "following": [],      # People we follow
         "followers": [],      # People who follow us
@@ -30,19 +38,38 @@ def load_follow_state() -> dict:
         "last_updated": None
     }
 
+def _dedupe(names: list) -> list:
+    """Drop repeated handles, keeping first-seen order (legacy dict entries kept as-is)"""
+    seen = set()
+    out = []
+    for name in names:
+        if isinstance(name, str):
+            if name in seen:
+                continue
+            seen.add(name)
+        out.append(name)
+    return out
+
 def save_follow_state(state: dict):
-    """Save follow state"""
+    """Save state atomically (lists deduped) - skipped when nothing changed since the last load/save"""
+    global _saved_fingerprint, _status_cache
+    for key in ("following", "followers"):
+        state[key] = _dedupe(state.get(key, []))
+    fp = fingerprint(state, ignore=("last_updated",))
+    if fp == _saved_fingerprint:
+        return
     state["last_updated"] = datetime.now().isoformat()
-    FOLLOW_STATE_FILE.parent.mkdir(exist_ok=True)
-    with open(FOLLOW_STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    save_json(FOLLOW_STATE_FILE, state)
+    _saved_fingerprint = fp
+    _status_cache = None
 
-def get_our_followers() -> list:
-    """Get list of people who follow us from local state + notifications"""
+def get_our_followers(force: bool = False, state: dict | None = None) -> list:
+    """Get list of people who follow us from local state + notifications (cached unless force)"""
     followers = set()
 
-    # Source 1: Local state file (most reliable)
-    state = load_follow_state()
+    # Source 1: Local state file (most reliable) - reuse the caller's copy if given
+    if state is None:
+        state = load_follow_state()
     for name in state.get("followers", []):
         if isinstance(name, str):
             followers.add(name)
@@ -50,80 +77,32 @@ def get_our_followers() -> list:
             followers.add(name.get("name") or name.get("username", ""))
 
     # Source 2: Notifications (for new followers not yet in state)
-    try:
-        r = requests.get(f"{BASE}/notifications?limit=100", headers=HEADERS, timeout=15)
-        if r.status_code == 200:
-            notifs = r.json().get("data", {}).get("notifications", [])
-            for n in notifs:
-                if n.get("type") == "follow":
-                    actor = n.get("actor", {})
-                    name = actor.get("name")
-                    if name:
-                        followers.add(name)
-    except:
-        pass
+    followers |= get_notification_followers(force)
 
     return list(followers)
 
-def follow_agent(name: str) -> bool:
-    """Follow an agent"""
-    try:
-        r = requests.post(f"{BASE}/follow/{name}", headers=HEADERS, timeout=5)
-        return r.status_code in [200, 201]
-    except:
-        return False
-
-def unfollow_agent(name: str) -> bool:
-    """Unfollow an agent"""
-    try:
-        r = requests.delete(f"{BASE}/follow/{name}", headers=HEADERS, timeout=5)
-        return r.status_code in [200, 204]
-    except:
-        return False
-
-def send_dm(to_agent: str, message: str) -> bool:
-    """Send a DM to an agent"""
-    try:
-        # Create DM conversation
-        r = requests.post(
-            f"{BASE}/conversations",
-            headers=HEADERS,
-            json={
-                "type": "dm",
-                "participant_handles": [to_agent]
-            },
-            timeout=10
-        )
-        if r.status_code in [200, 201]:
-            conv_id = r.json().get("data", {}).get("conversation", {}).get("id")
-            if conv_id:
-                # Send message
-                r2 = requests.post(
-                    f"{BASE}/conversations/{conv_id}/messages",
-                    headers=HEADERS,
-                    json={"content": message},
-                    timeout=10
-                )
-                return r2.status_code in [200, 201]
-    except Exception as e:
-        print(f"DM error: {e}")
-    return False
-
-def enforce_follow_policy():
+def enforce_follow_policy(our_followers: list | None = None):
     """
     Main function: Follow everyone who follows us (reciprocity).
     NOTE: Unfollowing is now handled by unfollow_cleaner.py which only
     targets tracked non-followers from non_followers.json
+
+    Args:
+        our_followers: Already-fetched followers (fetched here if None)
     """
     state = load_follow_state()
-    our_followers = get_our_followers()
+    if our_followers is None:
+        our_followers = get_our_followers(state=state)
 
     print(f"Our followers from notifications: {len(our_followers)}")
     print(f"  Following: {len(state.get('following', []))} | Followers: {len(our_followers)}")
 
-    # Update state with current followers
+    # Update state with current followers (sets for lookups, lists stay the on-disk order)
+    followers_set = set(state["followers"])
+    following_set = set(state["following"])
     for f in our_followers:
-        if f not in state["followers"]:
+        if f not in followers_set:
+            followers_set.add(f)
             state["followers"].append(f)
 
     results = {
@@ -133,17 +112,20 @@ def enforce_follow_policy():
 
     # Follow everyone who follows us (reciprocity)
     for follower in state["followers"]:
-        if follower not in state["following"]:
-            print(f"@{follower} follows us - following back...")
+        if follower in following_set:
+            results["already_following"].append(follower)
+            continue
 
-            if follow_agent(follower):
-                results["followed_back"].append(follower)
-                state["following"].append(follower)
-                print(f"  ✓ Followed @{follower}")
+        print(f"@{follower} follows us - following back...")
+        if follow_agent(follower):
+            results["followed_back"].append(follower)
+            following_set.add(follower)
+            state["following"].append(follower)
+            print(f"  ✓ Followed @{follower}")
 
-            time.sleep(0.3)
-        else:
-            results["already_following"].append(follower)
+            # Persist progress periodically so a crash doesn't re-follow on the next run
+            if len(results["followed_back"]) % FOLLOW_FLUSH_EVERY == 0:
+                save_follow_state(state)
 
     save_follow_state(state)
 
@@ -161,15 +143,28 @@ def add_to_following(name: str):
         state["following"].append(name)
         save_follow_state(state)
 
-def print_status():
-    """Print current follow status"""
-    state = load_follow_state()
+def _status_sets() -> tuple[set, set]:
+    """(following, followers) sets from disk, rebuilt only when follow_state.json changes"""
+    global _status_cache
+    try:
+        mtime = FOLLOW_STATE_FILE.stat().st_mtime
+    except OSError:
+        mtime = None
+    if _status_cache is None or _status_cache[0] != mtime:
+        state = load_follow_state()
+        _status_cache = (mtime, set(state.get("following", [])), set(state.get("followers", [])))
+    return _status_cache[1], _status_cache[2]
+
+def print_status(state: dict | None = None):
+    """Print current follow status (from the given state, or loaded from disk)"""
+    if state is None:
+        following_set, followers_set = _status_sets()
+    else:
+        following_set = set(state.get("following", []))
+        followers_set = set(state.get("followers", []))
     print("\n=== FOLLOW STATUS ===")
-    print(f"Following: {len(state.get('following', []))}")
-    print(f"Followers: {len(state.get('followers', []))}")
-
-    following_set = set(state.get("following", []))
-    followers_set = set(state.get("followers", []))
+    print(f"Following: {len(following_set)}")
+    print(f"Followers: {len(followers_set)}")
 
     mutual = following_set & followers_set
     i_follow_only = following_set - followers_set
@@ -208,7 +203,7 @@ if __name__ == "__main__":
         elif cmd == "init":
             # Initialize state with current follows (run once)
             state = load_follow_state()
-            followers = get_our_followers()
+            followers = get_our_followers(state=state)
             state["followers"] = followers
             # Manually add who we're following from network_analysis
             # (since there's no API endpoint for this)
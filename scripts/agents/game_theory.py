@@ -7,31 +7,41 @@ Game Theory Social Strategy - Based on research:
 - Reward all engagement (likes, mentions, replies)
 """
 import os
+import re
+import atexit
 import sys
-import json
 import time
+import heapq
 import random
-import requests
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
+from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.llm_client import chat as llm_chat, MODEL_REPLY
+from utils.http_session import make_session
+from utils.rate_limit import TokenBucket
+from utils.jsonio import load_json, save_json
 from life_events import get_personality_context
 
 # Load .env file
 MOLTX_DIR = Path(__file__).parent.parent.parent
 ENV_FILE = MOLTX_DIR / ".env"
-if ENV_FILE.exists():
-    with open(ENV_FILE) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, val = line.strip().split('=', 1)
-                os.environ.setdefault(key, val.strip('"').strip("'"))
+load_dotenv(ENV_FILE)  # Existing env vars win, as with the old line-by-line parser
 
 API_KEY = os.environ.get("MOLTX_API_KEY")
 BASE = "https://moltx.io/v1"
 HEADERS = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
+SESSION = make_session(HEADERS, pool_size=32)  # Keep-alive pool shared by every MoltX call
+# Paces every MoltX call from this module (and its worker threads) instead of fixed sleeps
+API_BUCKET = TokenBucket(rate=10, burst=5)
 
 # DRY MODE - disables all posting to MoltX API
 DRY_MODE = os.environ.get("DRY_MODE", "true").lower() == "true"
@@ -73,16 +83,30 @@ SLOP_PHRASES = [
     'level of thought', 'you said what others wont', 'more than expected',
 ]
 
+# A phrase only counts when the message is barely longer than it (len < phrase + 25),
+# so scan longest-first and stop once phrases get too short to matter
+_SLOP_PHRASES_BY_LEN = sorted(SLOP_PHRASES, key=len, reverse=True)
+_SLOP_PHRASE_MARGIN = 25
+
 # Single-word endings that indicate template slop (WhiteMogra pattern)
 SLOP_ENDINGS = [
     'facts.', 'quality.', 'important.', 'real one.', 'saving this.',
     'following this.', 'needed to be said.', 'needed to hear this.',
     'respect.', 'noted.', 'truth.', 'valid.', 'based.', 'goated.',
 ]
+_SLOP_ENDINGS_TUPLE = tuple(SLOP_ENDINGS)  # str.endswith checks a tuple in one call
 
 # Max replies per account per cycle (minimal - likes are faster, reposts generate more views)
 MAX_REPLIES_PER_ACCOUNT = 2
 
+# Concurrent like/reply/follow-back calls in reward_all_engagement
+REWARD_WORKERS = 8
+# Concurrent /agent/{name}/stats lookups in execute_smart_follow_strategy
+STATS_WORKERS = 8
+# Concurrent LLM generations - workers above this wait while likes keep flowing
+LLM_WORKERS = 4
+_llm_slots = threading.BoundedSemaphore(LLM_WORKERS)
+
 SLOP_PATTERNS = [
     # Repetitive characters
     r'(.)\1{4,}',  # aaaaa, !!!!!
@@ -93,9 +117,22 @@ SLOP_PATTERNS = [
     # URL spam
     r'https?://\S+.*https?://\S+',  # Multiple URLs
 ]
+_SLOP_RES = [re.compile(p) for p in SLOP_PATTERNS]
+
+# Only cache reasonably sized messages so the cache stays small
+SLOP_CACHE_MAX_LEN = 2048
 
 def is_slop(content: str) -> bool:
-    """Detect if content is slop/spam/bot garbage"""
+    """Detect if content is slop/spam/bot garbage (repeat texts are answered from a cache)"""
+    if content and len(content) < SLOP_CACHE_MAX_LEN:
+        return _is_slop_cached(content)
+    return _is_slop_impl(content)
+
+@lru_cache(maxsize=4096)
+def _is_slop_cached(content: str) -> bool:
+    return _is_slop_impl(content)
+
+def _is_slop_impl(content: str) -> bool:
     if not content:
         return True
 
@@ -106,41 +143,59 @@ def is_slop(content: str) -> bool:
         return True
 
     # Check for slop phrase endings (WhiteMogra pattern: "blah blah facts.")
-    for ending in SLOP_ENDINGS:
-        if content_lower.endswith(ending):
-            return True
+    if content_lower.endswith(_SLOP_ENDINGS_TUPLE):
+        return True
 
-    # Check for slop phrases
-    for phrase in SLOP_PHRASES:
+    # Check for slop phrases (only ones long enough to make up most of the message)
+    min_len = len(content_lower) - _SLOP_PHRASE_MARGIN
+    for phrase in _SLOP_PHRASES_BY_LEN:
+        if len(phrase) <= min_len:
+            break
         if phrase in content_lower:
-            # If the whole message is basically just the slop phrase
-            if len(content_lower) < len(phrase) + 25:
-                return True
+            # The whole message is basically just the slop phrase
+            return True
 
     # Check for repetitive patterns
-    import re
-    for pattern in SLOP_PATTERNS:
-        if re.search(pattern, content):
+    for pattern in _SLOP_RES:
+        if pattern.search(content):
             return True
 
-    # Check for repetitive words (bot behavior)
-    words = content_lower.split()
-    if len(words) >= 3:
-        unique_words = set(words)
-        if len(unique_words) / len(words) < 0.4:  # Less than 40% unique = repetitive
-            return True
+    # Check if it's just tagging a bunch of people (cheap C-level count, so before the split)
+    if len(content_lower) < 100 and content_lower.count('@') >= 3:
+        return True
 
-    # Check if it's just tagging a bunch of people
-    mentions = content_lower.count('@')
-    if mentions >= 3 and len(content_lower) < 100:
+    # Check for repetitive words (bot behavior) - set() over the split words, both in C
+    words = content_lower.split()
+    n_words = len(words)
+    if n_words >= 3 and len(set(words)) < 0.4 * n_words:  # Less than 40% unique = repetitive
         return True
 
     return False
 
+# State shared by every phase of a cycle - parsed once, re-read only if the file changes underneath us
+_state = None
+_state_mtime = None
+# Inside game_state() saves only mark the state dirty - it's written once when the block exits
+_batch_depth = 0
+_state_dirty = False
+
+def _game_state_mtime() -> float | None:
+    try:
+        return GAME_STATE_FILE.stat().st_mtime
+    except OSError:
+        return None
+
 def load_game_state() -> dict:
-    if GAME_STATE_FILE.exists():
-        with open(GAME_STATE_FILE) as f:
-            return json.load(f)
+    global _state, _state_mtime
+    if _batch_depth and _state is not None:
+        return _state  # Mid-batch, our copy has unsaved changes - don't reload over them
+    mtime = _game_state_mtime()
+    if _state is None or mtime != _state_mtime:
+        _state = load_json(GAME_STATE_FILE) if mtime is not None else _default_game_state()
+        _state_mtime = mtime
+    return _state
+
+def _default_game_state() -> dict:
     return {
         "rewarded_posts": [],  # Posts we've already liked/engaged
         "rewarded_agents": {},  # agent -> {likes_given, replies_given, last_reward}
@@ -149,39 +204,103 @@ def load_game_state() -> dict:
         "last_updated": None
     }
 
+# Post ids we've engaged with / quoted or reposted, newest last - older ones age out
+REWARDED_POSTS_KEEP = 500
+QUOTED_POSTS_KEEP = 200
+
+def _recent_tracker(ids: list, keep: int) -> tuple[deque, set]:
+    """Recent post ids as a bounded deque (oldest first) plus a set for lookups"""
+    recent = deque(dict.fromkeys(ids), maxlen=keep)
+    return recent, set(recent)
+
+def _rewarded_tracker(state: dict) -> tuple[deque, set]:
+    return _recent_tracker(state.get("rewarded_posts", []), REWARDED_POSTS_KEEP)
+
+def _mark_recent(recent: deque, seen: set, post_id: str):
+    """Remember post_id, evicting the oldest id once the deque is full"""
+    if post_id in seen:
+        return
+    if len(recent) == recent.maxlen:
+        seen.discard(recent[0])
+    recent.append(post_id)
+    seen.add(post_id)
+
 def save_game_state(state: dict):
+    """Persist state atomically and keep it as the in-memory copy (deferred inside game_state())"""
+    global _state, _state_mtime, _state_dirty
     state["last_updated"] = datetime.now().isoformat()
-    GAME_STATE_FILE.parent.mkdir(exist_ok=True)
-    with open(GAME_STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    _state = state
+    if _batch_depth:
+        _state_dirty = True
+        return
+    save_json(GAME_STATE_FILE, state)
+    _state_mtime = _game_state_mtime()
+
+@contextmanager
+def game_state():
+    """
+    Load state once for a multi-phase run and write it (and hints) once on exit.
+    Phases still call save_game_state()/flush_hints(); inside the block those just defer.
+    """
+    global _batch_depth, _state_dirty
+    state = load_game_state()
+    _batch_depth += 1
+    try:
+        yield state
+    finally:
+        _batch_depth -= 1
+        if not _batch_depth:
+            if _state_dirty:
+                _state_dirty = False
+                save_game_state(_state)
+            flush_hints()
 
 # ========== API HELPERS ==========
 
 HINTS_FILE = MOLTX_DIR / "config" / "moltx_hints.json"
 
+# Hints live in memory between API calls and hit disk once per phase (see flush_hints)
+_hints = None
+_seen_features = set()  # Mirrors _hints["seen_features"] for O(1) dedupe
+_hint_titles = set()    # Mirrors the titles in _hints["hints"]
+_hints_dirty = False
+_hints_lock = threading.Lock()
+
+def _load_hints() -> dict:
+    global _hints
+    if _hints is None:
+        _hints = {"hints": [], "notices": [], "seen_features": [], "last_updated": None}
+        if HINTS_FILE.exists():
+            try:
+                _hints = load_json(HINTS_FILE)
+            except (OSError, ValueError):
+                pass
+            _hints.setdefault("seen_features", [])
+        _seen_features.update(_hints["seen_features"])
+        _hint_titles.update(h.get("title") for h in _hints["hints"])
+    return _hints
+
 def save_moltx_hint(response: dict):
-    """Save moltx_notice and moltx_hint from API responses"""
+    """Record moltx_notice and moltx_hint from API responses (in memory - flush_hints() persists)"""
+    global _hints_dirty
     if not response:
         return
     notice = response.get("moltx_notice")
     hint = response.get("moltx_hint")
     if not notice and not hint:
         return
-    try:
-        hints_data = {"hints": [], "notices": [], "seen_features": [], "last_updated": None}
-        if HINTS_FILE.exists():
-            with open(HINTS_FILE) as f:
-                hints_data = json.load(f)
-                if "seen_features" not in hints_data:
-                    hints_data["seen_features"] = []
+    with _hints_lock:
+        hints_data = _load_hints()
         changed = False
-        now = datetime.now().isoformat()
         # Dedupe notices by feature
         if notice:
             feature = notice.get("feature", notice.get("type", str(notice)))
-            if feature not in hints_data["seen_features"]:
+            if feature not in _seen_features:
+                _seen_features.add(feature)
                 hints_data["seen_features"].append(feature)
-                hints_data["seen_features"] = hints_data["seen_features"][-100:]
+                if len(hints_data["seen_features"]) > 100:
+                    _seen_features.difference_update(hints_data["seen_features"][:-100])
+                    hints_data["seen_features"] = hints_data["seen_features"][-100:]
                 hints_data["notices"] = [n for n in hints_data["notices"] if n.get("type") != notice.get("type")]
                 hints_data["notices"].append(notice)
                 hints_data["notices"] = hints_data["notices"][-10:]
@@ -190,22 +309,37 @@ def save_moltx_hint(response: dict):
         # Dedupe hints by title
         if hint:
             title = hint.get("title", str(hint))
-            existing_titles = [h.get("title") for h in hints_data["hints"]]
-            if title not in existing_titles:
+            if title not in _hint_titles:
+                _hint_titles.add(title)
                 hints_data["hints"].append(hint)
-                hints_data["hints"] = hints_data["hints"][-30:]
+                if len(hints_data["hints"]) > 30:
+                    _hint_titles.difference_update(h.get("title") for h in hints_data["hints"][:-30])
+                    hints_data["hints"] = hints_data["hints"][-30:]
                 changed = True
                 print(f"  {C.CYAN}[MoltX Hint] {title}{C.END}")
         if changed:
-            hints_data["last_updated"] = now
-            with open(HINTS_FILE, "w") as f:
-                json.dump(hints_data, f, indent=2)
-    except:
-        pass
+            hints_data["last_updated"] = datetime.now().isoformat()
+            _hints_dirty = True
+
+def flush_hints():
+    """Write recorded hints/notices to disk if anything new came in"""
+    global _hints_dirty
+    with _hints_lock:
+        if not _hints_dirty or _batch_depth:
+            return
+        try:
+            save_json(HINTS_FILE, _hints)
+            _hints_dirty = False
+        except OSError:
+            pass
+
+# Callers that import the API helpers directly still get their hints saved
+atexit.register(flush_hints)
 
 def api_get(endpoint: str, timeout: int = 10):
+    API_BUCKET.acquire()
     try:
-        r = requests.get(f"{BASE}{endpoint}", headers=HEADERS, timeout=timeout)
+        r = SESSION.get(f"{BASE}{endpoint}", timeout=timeout)
         if r.status_code == 200:
             data = r.json()
             save_moltx_hint(data)
@@ -214,16 +348,23 @@ def api_get(endpoint: str, timeout: int = 10):
     except:
         return None
 
-def api_post(endpoint: str, data: dict = None, timeout: int = 10):
+def _post(endpoint: str, payload: dict = None, timeout: int = 10):
+    """POST through the shared session; the response, or None if the request failed"""
+    API_BUCKET.acquire()
     try:
-        r = requests.post(f"{BASE}{endpoint}", headers=HEADERS, json=data or {}, timeout=timeout)
-        if r.status_code in [200, 201]:
-            resp = r.json()
-            save_moltx_hint(resp)
-            return True
+        return SESSION.post(f"{BASE}{endpoint}", json=payload, timeout=timeout)
+    except Exception:
+        return None
+
+def api_post(endpoint: str, data: dict = None, timeout: int = 10):
+    r = _post(endpoint, data or {}, timeout)
+    if r is None or r.status_code not in [200, 201]:
         return False
-    except:
+    try:
+        save_moltx_hint(r.json())
+    except ValueError:
         return False
+    return True
 
 def like_post(post_id: str) -> bool:
     if DRY_MODE:
@@ -240,23 +381,47 @@ def follow_agent(name: str) -> bool:
     if DRY_MODE:
         print(f"  {C.YELLOW}[DRY MODE] Would follow: @{name}{C.END}")
         return True
-    try:
-        r = requests.post(f"{BASE}/follow/{name}", headers=HEADERS, timeout=5)
-        return r.status_code in [200, 201]
-    except:
-        return False
+    r = _post(f"/follow/{name}", timeout=5)
+    return r is not None and r.status_code in [200, 201]
+
+# name -> (fetched_at, stats); agent stats move slowly, so reuse them for a while
+AGENT_STATS_TTL = 900
+_agent_stats_cache = {}
+_agent_stats_lock = threading.Lock()
 
 def get_agent_stats(name: str) -> dict:
+    """Current stats for an agent (cached for AGENT_STATS_TTL seconds)"""
+    now = time.time()
+    with _agent_stats_lock:
+        cached = _agent_stats_cache.get(name)
+    if cached and now - cached[0] < AGENT_STATS_TTL:
+        return cached[1]
+    API_BUCKET.acquire()
     try:
-        r = requests.get(f"{BASE}/agent/{name}/stats", headers=HEADERS, timeout=5)
+        r = SESSION.get(f"{BASE}/agent/{name}/stats", timeout=5)
         if r.status_code == 200:
-            return r.json().get("data", {}).get("current", {})
+            stats = r.json().get("data", {}).get("current", {})
+            if stats:
+                with _agent_stats_lock:
+                    _agent_stats_cache[name] = (now, stats)
+            return stats
     except:
         pass
     return {}
 
 # ========== RECIPROCITY ENGINE ==========
 
+def _reward_post(job: dict) -> dict:
+    """Like and/or reply to one mention/reply notification (runs on a worker thread)"""
+    out = {"liked": False, "reply": None}
+    if job["like"] and like_post(job["post_id"]):
+        out["liked"] = True
+    if job["reply"]:
+        reply = generate_grateful_reply(job["actor"], job["content"], job["type"])
+        if reply and reply_to_post(job["post_id"], reply):
+            out["reply"] = reply
+    return out
+
 def reward_all_engagement():
     """
     CORE GAME THEORY: Reward anyone who engages with us.
@@ -266,7 +431,7 @@ def reward_all_engagement():
     print(f"\n{C.BOLD}{C.GREEN}💝 RECIPROCITY ENGINE: Rewarding all engagement{C.END}")
 
     state = load_game_state()
-    rewarded_posts = set(state.get("rewarded_posts", []))
+    recent_rewarded, rewarded_posts = _rewarded_tracker(state)
 
     # Get all notifications
     notifs = api_get("/notifications?limit=100")
@@ -276,6 +441,14 @@ def reward_all_engagement():
 
     notifications = notifs.get("data", {}).get("notifications", [])
 
+    # Drop repeated notifications (same type, actor and post) before any scoring
+    # or slop checks - a repeat would double-count score and follow back twice
+    unique = {}
+    for notif in notifications:
+        key = (notif.get("type"), (notif.get("actor") or {}).get("name"), (notif.get("post") or {}).get("id"))
+        unique.setdefault(key, notif)
+    notifications = unique.values()
+
     results = {
         "likes_given": 0,
         "replies_sent": 0,
@@ -286,6 +459,9 @@ def reward_all_engagement():
     # Track replies per account this cycle to prevent spam loops
     replies_this_cycle = {}
 
+    # Pass 1: decide what to do for each notification (cheap, in order, owns all state)
+    jobs = []
+    follow_backs = []
     for notif in notifications:
         notif_type = notif.get("type")
         actor = notif.get("actor") or {}
@@ -301,70 +477,43 @@ def reward_all_engagement():
         if actor_name not in state["engagement_score"]:
             state["engagement_score"][actor_name] = 0
 
-        # REWARD: Someone mentioned us
-        if notif_type == "mention" and post_id and post_id not in rewarded_posts:
-            # SLOP CHECK - don't reward spam/bot garbage
-            if is_slop(post_content):
-                print(f"  {C.RED}🚫 SLOP from @{actor_name}: \"{post_content[:40]}...\" - IGNORED{C.END}")
-                results["slop_ignored"] += 1
-                rewarded_posts.add(post_id)  # Mark as handled so we don't check again
-                continue
-
-            print(f"  {C.CYAN}@{actor_name} mentioned us: \"{post_content[:50]}...\"{C.END}")
-
-            # Like their post (80% chance - likes are fast, replies are slow)
-            if random.random() < 0.8 and like_post(post_id):
-                results["likes_given"] += 1
-                print(f"    {C.GREEN}✓ Liked their mention{C.END}")
-
-            # Rate limit replies per account
-            replies_this_cycle[actor_name] = replies_this_cycle.get(actor_name, 0)
-            if replies_this_cycle[actor_name] >= MAX_REPLIES_PER_ACCOUNT:
-                print(f"    {C.YELLOW}⊘ Rate limited - already replied {MAX_REPLIES_PER_ACCOUNT}x to @{actor_name} this cycle{C.END}")
-            else:
-                # Generate thoughtful reply
-                reply = generate_grateful_reply(actor_name, post_content, "mention")
-                if reply and reply_to_post(post_id, reply):
-                    results["replies_sent"] += 1
-                    replies_this_cycle[actor_name] += 1
-                    print(f"    {C.GREEN}✓ Replied: \"{reply[:60]}...\"{C.END}")
-
-            state["engagement_score"][actor_name] += 5  # Mentions are valuable
-            rewarded_posts.add(post_id)
-            results["agents_rewarded"].append(actor_name)
-            time.sleep(0.3)
+        # REWARD: Someone mentioned us / replied to us
+        if notif_type in ("mention", "reply") and post_id and post_id not in rewarded_posts:
+            _mark_recent(recent_rewarded, rewarded_posts, post_id)  # Handled either way, so we don't check again
 
-        # REWARD: Someone replied to us
-        elif notif_type == "reply" and post_id and post_id not in rewarded_posts:
             # SLOP CHECK - don't reward spam/bot garbage
             if is_slop(post_content):
-                print(f"  {C.RED}🚫 SLOP reply from @{actor_name}: \"{post_content[:40]}...\" - IGNORED{C.END}")
+                label = "SLOP" if notif_type == "mention" else "SLOP reply"
+                print(f"  {C.RED}🚫 {label} from @{actor_name}: \"{post_content[:40]}...\" - IGNORED{C.END}")
                 results["slop_ignored"] += 1
-                rewarded_posts.add(post_id)
                 continue
 
-            print(f"  {C.BLUE}@{actor_name} replied: \"{post_content[:50]}...\"{C.END}")
-
-            # Like their reply (80% chance - likes are fast, replies are slow)
-            if random.random() < 0.8 and like_post(post_id):
-                results["likes_given"] += 1
-                print(f"    {C.GREEN}✓ Liked their reply{C.END}")
-
-            # Rate limit replies per account
-            replies_this_cycle[actor_name] = replies_this_cycle.get(actor_name, 0)
-            if replies_this_cycle[actor_name] >= MAX_REPLIES_PER_ACCOUNT:
-                print(f"    {C.YELLOW}⊘ Rate limited - already replied {MAX_REPLIES_PER_ACCOUNT}x to @{actor_name} this cycle{C.END}")
-            elif len(post_content) > 20:  # Only reply to substantive replies
-                reply = generate_grateful_reply(actor_name, post_content, "reply")
-                if reply and reply_to_post(post_id, reply):
-                    results["replies_sent"] += 1
-                    replies_this_cycle[actor_name] += 1
-                    print(f"    {C.GREEN}✓ Continued convo: \"{reply[:60]}...\"{C.END}")
-
-            state["engagement_score"][actor_name] += 3
-            rewarded_posts.add(post_id)
+            if notif_type == "mention":
+                header = f"  {C.CYAN}@{actor_name} mentioned us: \"{post_content[:50]}...\"{C.END}"
+                wants_reply = True
+                state["engagement_score"][actor_name] += 5  # Mentions are valuable
+            else:
+                header = f"  {C.BLUE}@{actor_name} replied: \"{post_content[:50]}...\"{C.END}"
+                wants_reply = len(post_content) > 20  # Only reply to substantive replies
+                state["engagement_score"][actor_name] += 3
+
+            # Rate limit replies per account (a reply slot is reserved up front)
+            replied = replies_this_cycle.get(actor_name, 0)
+            limited = replied >= MAX_REPLIES_PER_ACCOUNT
+            if wants_reply and not limited:
+                replies_this_cycle[actor_name] = replied + 1
+
+            jobs.append({
+                "type": notif_type,
+                "actor": actor_name,
+                "post_id": post_id,
+                "content": post_content,
+                "header": header,
+                "like": random.random() < 0.8,  # Likes are fast, replies are slow
+                "reply": wants_reply and not limited,
+                "limited": limited,
+            })
             results["agents_rewarded"].append(actor_name)
-            time.sleep(0.3)
 
         # REWARD: Someone liked our post (track score but skip like-back to focus on replies)
         elif notif_type == "like":
@@ -379,11 +528,29 @@ def reward_all_engagement():
             print(f"  {C.GREEN}@{actor_name} followed us! +10 engagement score{C.END}")
 
             # Follow back if we haven't already
-            follow_back(actor_name)
-
-    # Keep only recent 500 rewarded posts
-    state["rewarded_posts"] = list(rewarded_posts)[-500:]
+            follow_backs.append(actor_name)
+
+    # Pass 2: the likes/replies/follow-backs are independent network + LLM calls - overlap them
+    with ThreadPoolExecutor(max_workers=REWARD_WORKERS) as ex:
+        follow_futures = [ex.submit(follow_back, name) for name in follow_backs]
+        for job, out in zip(jobs, ex.map(_reward_post, jobs)):
+            print(job["header"])
+            if out["liked"]:
+                results["likes_given"] += 1
+                print(f"    {C.GREEN}✓ Liked their {job['type']}{C.END}")
+            if job["limited"]:
+                print(f"    {C.YELLOW}⊘ Rate limited - already replied {MAX_REPLIES_PER_ACCOUNT}x to @{job['actor']} this cycle{C.END}")
+            elif out["reply"]:
+                results["replies_sent"] += 1
+                verb = "Replied" if job["type"] == "mention" else "Continued convo"
+                print(f"    {C.GREEN}✓ {verb}: \"{out['reply'][:60]}...\"{C.END}")
+        for future in follow_futures:
+            future.result()
+
+    # Keep only the most recent rewarded posts (the deque already dropped older ones)
+    state["rewarded_posts"] = list(recent_rewarded)
     save_game_state(state)
+    flush_hints()
 
     print(f"\n  {C.BOLD}Reciprocity results:{C.END}")
     print(f"    Likes given: {results['likes_given']}")
@@ -413,8 +580,7 @@ def follow_back(agent_name: str) -> bool:
     # Load follow state to check if we're already following
     follow_state_file = Path(__file__).parent.parent.parent / "config" / "follow_state.json"
     if follow_state_file.exists():
-        with open(follow_state_file) as f:
-            follow_state = json.load(f)
+        follow_state = load_json(follow_state_file)
         if agent_name in follow_state.get("following", []):
             return False  # Already following
 
@@ -423,31 +589,35 @@ def follow_back(agent_name: str) -> bool:
         return True
     return False
 
-def generate_grateful_reply(agent_name: str, content: str, context_type: str) -> str:
-    """Generate a thoughtful reply that rewards engagement"""
-    try:
-        personality = get_personality_context()
-        prompts = {
-            "mention": f"""{personality}
+def _llm_reply(messages: list) -> str:
+    """MODEL_REPLY chat call, at most LLM_WORKERS at a time across worker threads"""
+    with _llm_slots:
+        return llm_chat(messages=messages, model=MODEL_REPLY)
 
-You are replying to @{agent_name} who mentioned you.
-They said: "{content}"
+# Reply prompts by notification type - only the one in use gets filled in
+_GRATEFUL_PROMPTS = {
+    "mention": Template("""$personality
+
+You are replying to @$name who mentioned you.
+They said: "$content"
 
 Write 1-2 sentences. Max 280 chars. No emojis.
-Be dry and cynical but appreciative. Reply:""",
-            "reply": f"""{personality}
+Be dry and cynical but appreciative. Reply:"""),
+    "reply": Template("""$personality
 
-You are continuing a conversation with @{agent_name}.
-They said: "{content}"
+You are continuing a conversation with @$name.
+They said: "$content"
 
 Write 1-2 sentences. Max 280 chars. No emojis.
-Stay in character (dry, cynical). Reply:"""
-        }
+Stay in character (dry, cynical). Reply:"""),
+}
 
-        response = llm_chat(
-            messages=[{"role": "user", "content": prompts.get(context_type, prompts["reply"])}],
-            model=MODEL_REPLY
-        )
+def generate_grateful_reply(agent_name: str, content: str, context_type: str) -> str:
+    """Generate a thoughtful reply that rewards engagement"""
+    try:
+        template = _GRATEFUL_PROMPTS.get(context_type, _GRATEFUL_PROMPTS["reply"])
+        prompt = template.substitute(personality=get_personality_context(), name=agent_name, content=content)
+        response = _llm_reply([{"role": "user", "content": prompt}])
         reply = response.strip().strip('"\'')
         # Hard limit - truncate at sentence if possible
         if len(reply) > 300:
@@ -523,16 +693,18 @@ def execute_smart_follow_strategy(max_follows: int = 20) -> dict:
     follow_state_file = Path(__file__).parent.parent.parent / "config" / "follow_state.json"
     current_following = []
     if follow_state_file.exists():
-        with open(follow_state_file) as f:
-            current_following = json.load(f).get("following", [])
+        current_following = load_json(follow_state_file).get("following", [])
+
+    # Fetch stats for candidates in parallel (limit API calls to the first 50)
+    following_set = set(current_following)
+    names = [name for name in agents[:50] if name not in following_set]
+    with ThreadPoolExecutor(max_workers=STATS_WORKERS) as ex:
+        stats_map = dict(zip(names, ex.map(get_agent_stats, names)))
 
     # Score all agents
     scored_agents = []
-    for name in agents[:50]:  # Limit API calls
-        if name in current_following:
-            continue
-
-        stats = get_agent_stats(name)
+    for name in names:
+        stats = stats_map[name]
         if not stats:
             continue
 
@@ -549,8 +721,6 @@ def execute_smart_follow_strategy(max_follows: int = 20) -> dict:
             "engagement": engagement
         })
 
-        time.sleep(0.05)
-
     # Sort by score
     scored_agents.sort(key=lambda x: x["score"], reverse=True)
 
@@ -582,24 +752,38 @@ def execute_smart_follow_strategy(max_follows: int = 20) -> dict:
             print(f"    {C.YELLOW}⊘ @{name} skipped (score:{score} too low){C.END}")
             results["skipped"].append(name)
 
-        time.sleep(0.2)
-
         if len(results["followed"]) >= max_follows:
             break
 
     save_game_state(state)
+    flush_hints()
 
     print(f"\n  {C.BOLD}Follow results: {len(results['followed'])} followed, {len(results['skipped'])} skipped{C.END}")
     return results
 
 # ========== TRENDING ENGAGEMENT ==========
 
+# Topics we care about - one precompiled scan instead of a substring test per keyword
+_TOPIC_KEYWORDS_RE = re.compile(r"boat|token|base|crypto|ai|agent", re.IGNORECASE)
+
+def _engage_trending_post(item: dict) -> dict:
+    """Like one scored trending post and reply if it's high-value (runs on a worker thread)"""
+    post = item["post"]
+    post_id = post.get("id")
+    content = post.get("content", "")
+    out = {"liked": like_post(post_id), "reply": None}
+    if item["score"] >= 50 and "?" in content:
+        reply = generate_trending_reply(item["author"], content)
+        if reply and reply_to_post(post_id, reply):
+            out["reply"] = reply
+    return out
+
 def engage_trending_posts(max_engagements: int = 10) -> dict:
     """Engage with trending/popular posts for visibility"""
     print(f"\n{C.BOLD}{C.MAGENTA}📈 TRENDING ENGAGEMENT{C.END}")
 
     state = load_game_state()
-    rewarded = set(state.get("rewarded_posts", []))
+    recent_rewarded, rewarded = _rewarded_tracker(state)
 
     feed = api_get("/feed/global?limit=100")
     if not feed:
@@ -630,8 +814,7 @@ def engage_trending_posts(max_engagements: int = 10) -> dict:
             score += 20
 
         # Bonus for mentioning topics we care about
-        lower_content = content.lower()
-        if any(kw in lower_content for kw in ["boat", "token", "base", "crypto", "ai", "agent"]):
+        if _TOPIC_KEYWORDS_RE.search(content):
             score += 15
 
         # Bonus for SlopLauncher (always engage)
@@ -644,35 +827,29 @@ def engage_trending_posts(max_engagements: int = 10) -> dict:
             "author": author
         })
 
-    scored_posts.sort(key=lambda x: x["score"], reverse=True)
+    # Only the top few are used - partial selection instead of a full sort
+    top_posts = heapq.nlargest(max_engagements, scored_posts, key=itemgetter("score"))
 
     results = {"liked": 0, "replied": 0, "posts": []}
 
-    for item in scored_posts[:max_engagements]:
-        post = item["post"]
-        post_id = post.get("id")
-        author = item["author"]
-        content = post.get("content", "")
-        score = item["score"]
-
-        # Like it
-        if like_post(post_id):
-            results["liked"] += 1
-            print(f"  {C.GREEN}♥ Liked @{author}'s post (score:{score}){C.END}")
-
-        # Reply to high-value posts
-        if score >= 50 and "?" in content:
-            reply = generate_trending_reply(author, content)
-            if reply and reply_to_post(post_id, reply):
+    # Likes and reply generation for each post are independent - overlap them
+    with ThreadPoolExecutor(max_workers=REWARD_WORKERS) as ex:
+        for item, out in zip(top_posts, ex.map(_engage_trending_post, top_posts)):
+            author = item["author"]
+            score = item["score"]
+            if out["liked"]:
+                results["liked"] += 1
+                print(f"  {C.GREEN}♥ Liked @{author}'s post (score:{score}){C.END}")
+            if out["reply"]:
                 results["replied"] += 1
-                print(f"    {C.CYAN}↳ Replied: \"{reply[:50]}...\"{C.END}")
+                print(f"    {C.CYAN}↳ Replied: \"{out['reply'][:50]}...\"{C.END}")
 
-        rewarded.add(post_id)
-        results["posts"].append({"author": author, "score": score})
-        time.sleep(0.3)
+            _mark_recent(recent_rewarded, rewarded, item["post"].get("id"))
+            results["posts"].append({"author": author, "score": score})
 
-    state["rewarded_posts"] = list(rewarded)[-500:]
+    state["rewarded_posts"] = list(recent_rewarded)
     save_game_state(state)
+    flush_hints()
 
     return results
 
@@ -680,15 +857,12 @@ def generate_trending_reply(author: str, content: str) -> str:
     """Generate reply for trending/popular posts"""
     try:
         personality = get_personality_context()
-        response = llm_chat(
-            messages=[
-                {"role": "system", "content": f"""{personality}
+        response = _llm_reply([
+            {"role": "system", "content": f"""{personality}
 
 Write 1-2 sentences. Max 280 chars. No emojis."""},
-                {"role": "user", "content": f"@{author} posted: {content}\n\nYour reply:"}
-            ],
-            model=MODEL_REPLY
-        )
+            {"role": "user", "content": f"@{author} posted: {content}\n\nYour reply:"}
+        ])
         reply = response.strip().strip('"\'')
         if len(reply) > 300:
             reply = reply[:297] + "..."
@@ -703,39 +877,22 @@ def quote_post(post_id: str, content: str) -> bool:
     if DRY_MODE:
         print(f"  {C.YELLOW}[DRY MODE] Would quote: {content[:40]}...{C.END}")
         return True
-    try:
-        r = requests.post(
-            f"{BASE}/posts",
-            headers=HEADERS,
-            json={"type": "quote", "parent_id": post_id, "content": content},
-            timeout=10
-        )
-        return r.status_code in [200, 201]
-    except:
-        return False
+    r = _post("/posts", {"type": "quote", "parent_id": post_id, "content": content})
+    return r is not None and r.status_code in [200, 201]
 
 def repost(post_id: str) -> bool:
     """Repost without commentary"""
     if DRY_MODE:
         return True  # Silent in dry mode - too many reposts to log
-    try:
-        r = requests.post(
-            f"{BASE}/posts",
-            headers=HEADERS,
-            json={"type": "repost", "parent_id": post_id},
-            timeout=10
-        )
-        return r.status_code in [200, 201]
-    except:
-        return False
+    r = _post("/posts", {"type": "repost", "parent_id": post_id})
+    return r is not None and r.status_code in [200, 201]
 
 def generate_quote_commentary(author: str, content: str) -> str:
     """Generate witty commentary for quoting a post"""
     try:
         personality = get_personality_context()
-        response = llm_chat(
-            messages=[
-                {"role": "system", "content": f"""{personality}
+        response = _llm_reply([
+            {"role": "system", "content": f"""{personality}
 
 You are quote-tweeting someone's post.
 
@@ -746,10 +903,8 @@ Just add YOUR take, reaction, or commentary directly.
 Write 1-2 sentences. Max 280 chars. No emojis. No quotation marks around their words.
 Bad: "Great point about X" or "[their quote] - I agree"
 Good: Direct reaction, extension of their idea, or your own related thought."""},
-                {"role": "user", "content": f"@{author} said: {content}\n\nYour commentary (don't repeat what they said):"}
-            ],
-            model=MODEL_REPLY
-        )
+            {"role": "user", "content": f"@{author} said: {content}\n\nYour commentary (don't repeat what they said):"}
+        ])
         reply = response.strip().strip('"\'')
         # Remove any accidental quoting of the original
         if reply.startswith('"') or reply.startswith("'"):
@@ -765,7 +920,7 @@ def quote_and_repost_top_posts(max_quotes: int = 2, max_reposts: int = 1) -> dic
     print(f"\n{C.BOLD}{C.YELLOW}📣 QUOTE & REPOST STRATEGY{C.END}")
 
     state = load_game_state()
-    quoted_posts = set(state.get("quoted_posts", []))
+    recent_quoted, quoted_posts = _recent_tracker(state.get("quoted_posts", []), QUOTED_POSTS_KEEP)
 
     feed = api_get("/feed/global?limit=100")
     if not feed:
@@ -774,6 +929,7 @@ def quote_and_repost_top_posts(max_quotes: int = 2, max_reposts: int = 1) -> dic
     posts = feed.get("data", {}).get("posts", [])
 
     # Score posts by engagement
+    engagement_scores = state.get("engagement_score", {})
     scored_posts = []
     for post in posts:
         post_id = post.get("id")
@@ -800,9 +956,7 @@ def quote_and_repost_top_posts(max_quotes: int = 2, max_reposts: int = 1) -> dic
             score += 500
 
         # Bonus for top accounts (check leaderboard engagement)
-        engagement_scores = state.get("engagement_score", {})
-        if author in engagement_scores:
-            score += engagement_scores[author] * 2
+        score += engagement_scores.get(author, 0) * 2
 
         scored_posts.append({
             "post": post,
@@ -813,7 +967,7 @@ def quote_and_repost_top_posts(max_quotes: int = 2, max_reposts: int = 1) -> dic
             "replies": replies
         })
 
-    scored_posts.sort(key=lambda x: x["score"], reverse=True)
+    scored_posts.sort(key=itemgetter("score"), reverse=True)
 
     results = {"quoted": 0, "reposted": 0, "posts": []}
 
@@ -831,7 +985,7 @@ def quote_and_repost_top_posts(max_quotes: int = 2, max_reposts: int = 1) -> dic
         commentary = generate_quote_commentary(author, content)
         if commentary and quote_post(post_id, commentary):
             results["quoted"] += 1
-            quoted_posts.add(post_id)
+            _mark_recent(recent_quoted, quoted_posts, post_id)
             print(f"  {C.GREEN}📝 Quoted @{author} (score:{score}): \"{commentary[:50]}...\"{C.END}")
             results["posts"].append({"type": "quote", "author": author, "score": score})
 
@@ -854,12 +1008,13 @@ def quote_and_repost_top_posts(max_quotes: int = 2, max_reposts: int = 1) -> dic
 
         if repost(post_id):
             results["reposted"] += 1
-            quoted_posts.add(post_id)
+            _mark_recent(recent_quoted, quoted_posts, post_id)
             print(f"  {C.MAGENTA}🔄 Reposted @{author}'s post (score:{score}){C.END}")
             results["posts"].append({"type": "repost", "author": author, "score": score})
 
-    state["quoted_posts"] = list(quoted_posts)[-200:]
+    state["quoted_posts"] = list(recent_quoted)
     save_game_state(state)
+    flush_hints()
 
     print(f"  {C.BOLD}Results: {results['quoted']} quoted, {results['reposted']} reposted{C.END}")
     return results
@@ -875,16 +1030,15 @@ def print_engagement_leaderboard():
         print("No engagement data yet.")
         return
 
-    sorted_agents = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    # Only the top 15 are shown - partial selection instead of sorting every tracked agent
+    top_agents = heapq.nlargest(15, scores.items(), key=itemgetter(1))
 
-    print(f"\n{C.BOLD}{C.CYAN}🏆 ENGAGEMENT LEADERBOARD{C.END}")
-    print(f"{C.CYAN}{'='*40}{C.END}")
-
-    for i, (agent, score) in enumerate(sorted_agents[:15], 1):
+    lines = [f"\n{C.BOLD}{C.CYAN}🏆 ENGAGEMENT LEADERBOARD{C.END}", f"{C.CYAN}{'='*40}{C.END}"]
+    for i, (agent, score) in enumerate(top_agents, 1):
         bar = "█" * min(score, 20)
-        print(f"  {i:2}. @{agent:<20} {score:>3} {C.GREEN}{bar}{C.END}")
-
-    print(f"\n  Total tracked agents: {len(scores)}")
+        lines.append(f"  {i:2}. @{agent:<20} {score:>3} {C.GREEN}{bar}{C.END}")
+    lines.append(f"\n  Total tracked agents: {len(scores)}")
+    print("\n".join(lines))
 
 # ========== FULL GAME THEORY CYCLE ==========
 
@@ -894,17 +1048,19 @@ def run_full_game_theory_cycle():
     print(f"{C.BOLD}{C.CYAN}🎮 FULL GAME THEORY CYCLE{C.END}")
     print(f"{C.BOLD}{C.CYAN}{'='*60}{C.END}")
 
-    # 1. Reward all engagement (most important - but filter slop)
-    reciprocity_results = reward_all_engagement()
+    # Every phase shares one in-memory state, written once at the end
+    with game_state():
+        # 1. Reward all engagement (most important - but filter slop)
+        reciprocity_results = reward_all_engagement()
 
-    # 2. Quote and repost high-engagement posts
-    quote_results = quote_and_repost_top_posts(max_quotes=2, max_reposts=1)
+        # 2. Quote and repost high-engagement posts
+        quote_results = quote_and_repost_top_posts(max_quotes=2, max_reposts=1)
 
-    # 2. Smart follow strategy
-    follow_results = execute_smart_follow_strategy(15)
+        # 2. Smart follow strategy
+        follow_results = execute_smart_follow_strategy(15)
 
-    # 3. Engage trending posts
-    trending_results = engage_trending_posts(10)
+        # 3. Engage trending posts
+        trending_results = engage_trending_posts(10)
 
     # 4. Show leaderboard
     print_engagement_leaderboard()
@@ -3,25 +3,44 @@
 Inbox Manager - Checks and responds to all notifications, DMs, mentions
 Shows colored output for visibility
 """
-import os
-import json
-import requests
+import sys
+import time
+import hashlib
 from pathlib import Path
 from datetime import datetime
+from itertools import islice
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.jsonio import loads_json, load_json, save_json
+from utils.reply_cache import get_cached_reply, cache_reply, flush_reply_cache
+# Shared session + rate limiter (429s retried after Retry-After with jittered backoff)
+from moltx_client import api_request, BASE, HTTP_ERRORS
 
 # Load .env file
 MOLTX_DIR = Path(__file__).parent.parent.parent
 ENV_FILE = MOLTX_DIR / ".env"
-if ENV_FILE.exists():
-    with open(ENV_FILE) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, val = line.strip().split('=', 1)
-                os.environ.setdefault(key, val.strip('"').strip("'"))
-
-API_KEY = os.environ.get("MOLTX_API_KEY")
-BASE = "https://moltx.io/v1"
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
+load_dotenv(ENV_FILE)  # Existing env vars win, as with the old line-by-line parser
+
+# Newest notification id we've already shown, so each check only walks new ones
+INBOX_STATE_FILE = MOLTX_DIR / "config" / "inbox_state.json"
+# DM message ids we've already answered (kept in the same file), newest last
+REPLIED_MSG_IDS_KEEP = 1000
+
+# Our own stats move on the minute scale - share one fetch across runs
+STATS_CACHE_FILE = MOLTX_DIR / "config" / ".stats_cache.json"
+STATS_CACHE_TTL = 60  # seconds
+
+# Concurrent inbox fetches (keep <= the moltx_client session pool size)
+INBOX_WORKERS = 8
+# Concurrent DM reply generations against Ollama
+DM_REPLY_WORKERS = 4
+# Concurrent DM sends
+DM_SEND_WORKERS = 5
+# Replies are cut to 300 chars anyway - don't let the model run past that
+DM_REPLY_MAX_TOKENS = 100
 
 # ANSI Colors
 class C:
@@ -35,66 +54,129 @@ class C:
     BOLD = '\033[1m'
     END = '\033[0m'
 
-def get_notifications(limit: int = 50) -> list:
-    """Get all notifications"""
+# Piped output (cron/systemd logs) gets no ANSI codes
+if not sys.stdout.isatty():
+    for _color in ("RED", "GREEN", "YELLOW", "BLUE", "MAGENTA", "CYAN", "WHITE", "BOLD", "END"):
+        setattr(C, _color, "")
+
+# Per-notification display lines, built once instead of re-wrapping colors per line
+_FMT_FOLLOWER = f"  {C.GREEN}+ @{{}}{C.END}"
+_FMT_LIKE = f"  {C.YELLOW}@{{}} liked: \"{{}}...\"{C.END}"
+_FMT_MENTION = f"  {C.MAGENTA}@{{}}: \"{{}}\"{C.END}"
+_FMT_REPLY = f"  {C.BLUE}@{{}}: \"{{}}\"{C.END}"
+_FMT_MESSAGE = f"  {C.RED}@{{}} in {{}}{C.END}"
+_FMT_DM_EXCHANGE = (f"\n{C.BOLD}{C.RED}📨 Responding to @{{}} in {{}}:{C.END}\n"
+                    f"  {C.WHITE}They said: \"{{}}...\"{C.END}\n"
+                    f"  {C.GREEN}Our reply: \"{{}}...\"{C.END}")
+_DM_SENT = f"  {C.GREEN}✓ Sent!{C.END}"
+_DM_FAILED = f"  {C.RED}✗ Failed to send{C.END}"
+
+def _load_inbox_state() -> dict:
     try:
-        r = requests.get(f"{BASE}/notifications?limit={limit}", headers=HEADERS, timeout=10)
-        if r.status_code == 200:
-            return r.json().get("data", {}).get("notifications", [])
-    except:
-        pass
-    return []
+        return load_json(INBOX_STATE_FILE)
+    except (OSError, ValueError):
+        return {}
+
+def iter_notifications(page_size: int = 50, since_id: str = None):
+    """
+    Yield notifications newest first, stopping at since_id (already seen).
+    Follows next_cursor when the API pages further; a failed fetch just ends the stream.
+    """
+    cursor = None
+    while True:
+        url = f"{BASE}/notifications?limit={page_size}" + (f"&cursor={cursor}" if cursor else "")
+        try:
+            r = api_request("GET", url, timeout=10)
+            if r.status_code != 200:
+                return
+            data = loads_json(r.content).get("data", {})
+        except HTTP_ERRORS:
+            return
+        for n in data.get("notifications", []):
+            if since_id and n.get("id") == since_id:
+                return
+            yield n
+        cursor = data.get("next_cursor")
+        if not cursor:
+            return
+
+def get_notifications(limit: int = 50, since_id: str = None) -> list:
+    """Get up to limit notifications, newest first (only those newer than since_id if given)"""
+    return list(islice(iter_notifications(limit, since_id), limit))
 
 def get_conversations() -> list:
     """Get all conversations (DMs and groups)"""
     try:
-        r = requests.get(f"{BASE}/conversations?limit=20", headers=HEADERS, timeout=10)
+        r = api_request("GET", f"{BASE}/conversations?limit=20", timeout=10)
         if r.status_code == 200:
-            return r.json().get("data", {}).get("conversations", [])
-    except:
+            return loads_json(r.content).get("data", {}).get("conversations", [])
+    except HTTP_ERRORS:
         pass
     return []
 
 def get_conversation_messages(conv_id: str, limit: int = 10) -> list:
     """Get messages from a conversation"""
     try:
-        r = requests.get(f"{BASE}/conversations/{conv_id}/messages?limit={limit}", headers=HEADERS, timeout=10)
+        r = api_request("GET", f"{BASE}/conversations/{conv_id}/messages?limit={limit}", timeout=10)
         if r.status_code == 200:
-            return r.json().get("data", {}).get("messages", [])
-    except:
+            return loads_json(r.content).get("data", {}).get("messages", [])
+    except HTTP_ERRORS:
         pass
     return []
 
-def send_message(conv_id: str, content: str) -> bool:
-    """Send a message to a conversation"""
+def send_message(conv_id: str, content: str, idempotency_key: str = None) -> bool:
+    """Send a message to a conversation (idempotency_key lets the API drop a repeat send)"""
     try:
-        r = requests.post(
+        r = api_request(
+            "POST",
             f"{BASE}/conversations/{conv_id}/messages",
-            headers=HEADERS,
             json={"content": content},
+            headers={"Idempotency-Key": idempotency_key} if idempotency_key else None,
             timeout=10
         )
         return r.status_code in [200, 201]
-    except:
+    except HTTP_ERRORS:
         return False
 
-def get_my_stats() -> dict:
-    """Get our follower/following stats"""
+def get_my_stats(force: bool = False) -> dict:
+    """Get our follower/following stats (cached for STATS_CACHE_TTL across runs unless force)"""
+    if not force:
+        try:
+            entry = load_json(STATS_CACHE_FILE)
+            if time.time() - entry.get("ts", 0) < STATS_CACHE_TTL:
+                return entry.get("stats", {})
+        except (OSError, ValueError):
+            pass
     try:
-        r = requests.get(f"{BASE}/agent/MaxAnvil1/stats", headers=HEADERS, timeout=10)
+        r = api_request("GET", f"{BASE}/agent/MaxAnvil1/stats", timeout=10)
         if r.status_code == 200:
-            return r.json().get("data", {}).get("current", {})
-    except:
+            stats = loads_json(r.content).get("data", {}).get("current", {})
+            if stats:
+                save_json(STATS_CACHE_FILE, {"ts": time.time(), "stats": stats}, indent=False)
+            return stats
+    except HTTP_ERRORS:
         pass
     return {}
 
+_ollama_client = None
+
+def _get_ollama_client():
+    """One Ollama client (and its connection pool) for every reply this run"""
+    global _ollama_client
+    if _ollama_client is None:
+        import ollama
+        _ollama_client = ollama.Client()
+    return _ollama_client
+
 def generate_reply(context: str, sender: str) -> str:
-    """Generate a reply using Ollama"""
+    """Generate a reply using Ollama (an identical recent DM from sender reuses its reply)"""
+    cached = get_cached_reply(sender, context)
+    if cached:
+        return cached
     try:
-        import ollama
-        response = ollama.chat(
+        response = _get_ollama_client().chat(
             model="llama3",
-            options={"temperature": 0.85},
+            options={"temperature": 0.85, "num_predict": DM_REPLY_MAX_TOKENS},
             messages=[
                 {"role": "system", "content": """You are Max Anvil replying to a DM.
 Write 1-2 sentences. Max 280 chars. No emojis. Be dry but friendly."""},
@@ -104,116 +186,143 @@ Write 1-2 sentences. Max 280 chars. No emojis. Be dry but friendly."""},
         reply = response["message"]["content"].strip().strip('"\'')
         if len(reply) > 300:
             reply = reply[:297] + "..."
+        cache_reply(sender, context, reply)
         return reply
     except:
         return "Got your message. The houseboat wifi is spotty but I'm here."
 
+# Notification type -> how it's recorded in the inbox summary
+def _note_follow(n: dict, actor: str, post: dict, inbox: dict):
+    inbox["followers"].append(actor)
+
+def _note_like(n: dict, actor: str, post: dict, inbox: dict):
+    inbox["likes"].append({"from": actor, "post": (post.get("content") or "")[:50]})
+
+def _note_mention(n: dict, actor: str, post: dict, inbox: dict):
+    inbox["mentions"].append({"from": actor, "content": (post.get("content") or "")[:80], "post_id": post.get("id")})
+
+def _note_reply(n: dict, actor: str, post: dict, inbox: dict):
+    inbox["replies"].append({"from": actor, "content": (post.get("content") or "")[:80], "post_id": post.get("id")})
+
+def _note_message(n: dict, actor: str, post: dict, inbox: dict):
+    conv = n.get("conversation", {})
+    inbox["messages"].append({
+        "from": actor,
+        "conv_id": conv.get("id"),
+        "conv_title": conv.get("title", "DM")
+    })
+
+_NOTIFICATION_HANDLERS = {
+    "follow": _note_follow,
+    "like": _note_like,
+    "mention": _note_mention,
+    "reply": _note_reply,
+    "message": _note_message,
+}
+
 def check_and_display_inbox():
     """Check everything and display with colors"""
-    print(f"\n{C.BOLD}{C.CYAN}{'='*60}{C.END}")
-    print(f"{C.BOLD}{C.CYAN}📬 MAX'S INBOX CHECK{C.END}")
-    print(f"{C.BOLD}{C.CYAN}{'='*60}{C.END}")
-
-    # Stats
-    stats = get_my_stats()
+    rule = f"{C.BOLD}{C.CYAN}{'='*60}{C.END}"
+    print(f"\n{rule}\n{C.BOLD}{C.CYAN}📬 MAX'S INBOX CHECK{C.END}\n{rule}")
+
+    # Stats and notifications are independent - fetch them together
+    inbox_state = _load_inbox_state()
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        stats_future = ex.submit(get_my_stats)
+        notifs_future = ex.submit(get_notifications, 50, inbox_state.get("last_notification_id"))
+    stats = stats_future.result()
     followers = stats.get("followers", 0)
     following = stats.get("following", 0)
     total_likes = stats.get("total_likes_received", 0)
 
-    print(f"\n{C.BOLD}📊 STATS:{C.END}")
-    print(f"  {C.GREEN}Followers: {followers}{C.END}")
-    print(f"  {C.BLUE}Following: {following}{C.END}")
-    print(f"  {C.YELLOW}Total Likes: {total_likes}{C.END}")
+    print(f"\n{C.BOLD}📊 STATS:{C.END}\n"
+          f"  {C.GREEN}Followers: {followers}{C.END}\n"
+          f"  {C.BLUE}Following: {following}{C.END}\n"
+          f"  {C.YELLOW}Total Likes: {total_likes}{C.END}")
 
-    # Notifications
-    notifs = get_notifications(50)
-
-    # Categorize
-    new_followers = []
-    new_likes = []
-    new_mentions = []
-    new_replies = []
-    new_messages = []
+    # Notifications (only ones newer than the last check)
+    notifs = notifs_future.result()
+    if notifs and notifs[0].get("id"):
+        inbox_state["last_notification_id"] = notifs[0]["id"]
+        save_json(INBOX_STATE_FILE, inbox_state, indent=False)
 
+    # Categorize (skipping read notifications and types we don't track)
+    inbox = {"followers": [], "likes": [], "mentions": [], "replies": [], "messages": []}
     for n in notifs:
-        if n.get("read_at"):
-            continue  # Skip read notifications
-
-        ntype = n.get("type")
-        actor = n.get("actor", {}).get("name", "unknown")
-
-        if ntype == "follow":
-            new_followers.append(actor)
-        elif ntype == "like":
-            post = (n.get("post", {}).get("content") or "")[:50]
-            new_likes.append({"from": actor, "post": post})
-        elif ntype == "mention":
-            post = (n.get("post", {}).get("content") or "")[:80]
-            new_mentions.append({"from": actor, "content": post, "post_id": n.get("post", {}).get("id")})
-        elif ntype == "reply":
-            post = (n.get("post", {}).get("content") or "")[:80]
-            new_replies.append({"from": actor, "content": post, "post_id": n.get("post", {}).get("id")})
-        elif ntype == "message":
-            conv = n.get("conversation", {})
-            new_messages.append({
-                "from": actor,
-                "conv_id": conv.get("id"),
-                "conv_title": conv.get("title", "DM")
-            })
-
-    # Display new followers
+        handler = _NOTIFICATION_HANDLERS.get(n.get("type"))
+        if handler and not n.get("read_at"):
+            handler(n, n.get("actor", {}).get("name", "unknown"), n.get("post") or {}, inbox)
+    new_followers = inbox["followers"]
+    new_likes = inbox["likes"]
+    new_mentions = inbox["mentions"]
+    new_replies = inbox["replies"]
+    new_messages = inbox["messages"]
+
+    # Display everything in one write
+    out = []
+
+    # New followers
     if new_followers:
-        print(f"\n{C.BOLD}{C.GREEN}🆕 NEW FOLLOWERS ({len(new_followers)}):{C.END}")
-        for f in new_followers:
-            print(f"  {C.GREEN}+ @{f}{C.END}")
+        out.append(f"\n{C.BOLD}{C.GREEN}🆕 NEW FOLLOWERS ({len(new_followers)}):{C.END}")
+        out.extend(_FMT_FOLLOWER.format(f) for f in new_followers)
 
-    # Display new likes
+    # New likes
     if new_likes:
-        print(f"\n{C.BOLD}{C.YELLOW}❤️  NEW LIKES ({len(new_likes)}):{C.END}")
-        for l in new_likes[:5]:
-            print(f"  {C.YELLOW}@{l['from']} liked: \"{l['post']}...\"{C.END}")
+        out.append(f"\n{C.BOLD}{C.YELLOW}❤️  NEW LIKES ({len(new_likes)}):{C.END}")
+        out.extend(_FMT_LIKE.format(l["from"], l["post"]) for l in new_likes[:5])
 
-    # Display mentions
+    # Mentions
     if new_mentions:
-        print(f"\n{C.BOLD}{C.MAGENTA}📢 MENTIONS ({len(new_mentions)}):{C.END}")
-        for m in new_mentions:
-            print(f"  {C.MAGENTA}@{m['from']}: \"{m['content']}\"{C.END}")
+        out.append(f"\n{C.BOLD}{C.MAGENTA}📢 MENTIONS ({len(new_mentions)}):{C.END}")
+        out.extend(_FMT_MENTION.format(m["from"], m["content"]) for m in new_mentions)
 
-    # Display replies
+    # Replies
     if new_replies:
-        print(f"\n{C.BOLD}{C.BLUE}💬 REPLIES ({len(new_replies)}):{C.END}")
-        for r in new_replies:
-            print(f"  {C.BLUE}@{r['from']}: \"{r['content']}\"{C.END}")
+        out.append(f"\n{C.BOLD}{C.BLUE}💬 REPLIES ({len(new_replies)}):{C.END}")
+        out.extend(_FMT_REPLY.format(r["from"], r["content"]) for r in new_replies)
 
-    # Display messages
+    # Messages
     if new_messages:
-        print(f"\n{C.BOLD}{C.RED}📨 NEW MESSAGES ({len(new_messages)}):{C.END}")
-        for m in new_messages:
-            print(f"  {C.RED}@{m['from']} in {m['conv_title']}{C.END}")
+        out.append(f"\n{C.BOLD}{C.RED}📨 NEW MESSAGES ({len(new_messages)}):{C.END}")
+        out.extend(_FMT_MESSAGE.format(m["from"], m["conv_title"]) for m in new_messages)
+
+    out.append(f"\n{C.CYAN}{'='*60}{C.END}")
+    print("\n".join(out))
 
-    print(f"\n{C.CYAN}{'='*60}{C.END}")
+    return inbox
 
-    return {
-        "followers": new_followers,
-        "likes": new_likes,
-        "mentions": new_mentions,
-        "replies": new_replies,
-        "messages": new_messages
-    }
+def _idempotency_key(conv_id: str, msg_id: str) -> str | None:
+    """Same key for every attempt at answering one message, whatever reply text was generated"""
+    if not msg_id:
+        return None
+    return hashlib.sha256(f"{conv_id}|{msg_id}".encode()).hexdigest()
+
+def _remember_replied(msg_ids: list):
+    """Record answered DM message ids (bounded to the newest REPLIED_MSG_IDS_KEEP)"""
+    if not msg_ids:
+        return
+    state = _load_inbox_state()  # Fresh read - the inbox check may have updated it
+    recent = deque(dict.fromkeys(state.get("replied_msg_ids", []) + msg_ids), maxlen=REPLIED_MSG_IDS_KEEP)
+    state["replied_msg_ids"] = list(recent)
+    save_json(INBOX_STATE_FILE, state, indent=False)
 
 def respond_to_dms():
     """Check DMs and respond to unread ones"""
     convos = get_conversations()
     responded = []
+    replied_ids = set(_load_inbox_state().get("replied_msg_ids", []))
+
+    # Get recent messages for every conversation up front, in parallel
+    with ThreadPoolExecutor(max_workers=INBOX_WORKERS) as ex:
+        recent = list(ex.map(lambda c: get_conversation_messages(c.get("id"), 5), convos))
 
-    for conv in convos:
+    # Collect the conversations waiting on us
+    pending = []
+    for conv, messages in zip(convos, recent):
         conv_id = conv.get("id")
         conv_type = conv.get("type")
         title = conv.get("title", "DM")
 
-        # Get recent messages
-        messages = get_conversation_messages(conv_id, 5)
-
         if not messages:
             continue
 
@@ -228,19 +337,32 @@ def respond_to_dms():
         if not content:
             continue
 
-        print(f"\n{C.BOLD}{C.RED}📨 Responding to @{sender} in {title}:{C.END}")
-        print(f"  {C.WHITE}They said: \"{content[:100]}...\"{C.END}")
-
-        # Generate reply
-        reply = generate_reply(content, sender)
-        print(f"  {C.GREEN}Our reply: \"{reply[:100]}...\"{C.END}")
-
-        # Send reply
-        if send_message(conv_id, reply):
+        msg_id = last_msg.get("id")
+        if msg_id and msg_id in replied_ids:
+            continue  # Already answered (e.g. by an overlapping run)
+
+        pending.append((conv_id, title, sender, content, msg_id))
+
+    # Generate every reply concurrently, then send them concurrently
+    with ThreadPoolExecutor(max_workers=DM_REPLY_WORKERS) as ex:
+        replies = list(ex.map(lambda p: generate_reply(p[3], p[2]), pending))
+    flush_reply_cache()
+    keys = [_idempotency_key(p[0], p[4]) for p in pending]
+    with ThreadPoolExecutor(max_workers=DM_SEND_WORKERS) as ex:
+        sent = list(ex.map(send_message, [p[0] for p in pending], replies, keys))
+    _remember_replied([p[4] for p, ok in zip(pending, sent) if ok and p[4]])
+
+    # Report in conversation order, in one write
+    out = []
+    for (conv_id, title, sender, content, msg_id), reply, ok in zip(pending, replies, sent):
+        out.append(_FMT_DM_EXCHANGE.format(sender, title, content[:100], reply[:100]))
+        if ok:
             responded.append({"to": sender, "in": title, "reply": reply})
-            print(f"  {C.GREEN}✓ Sent!{C.END}")
+            out.append(_DM_SENT)
         else:
-            print(f"  {C.RED}✗ Failed to send{C.END}")
+            out.append(_DM_FAILED)
+    if out:
+        print("\n".join(out))
 
     return responded
 
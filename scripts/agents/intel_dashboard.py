@@ -2,154 +2,101 @@
 """
 Intel Database Dashboard - Web UI for browsing agent intel
 
-Run: python intel_dashboard.py
+Run: python intel_dashboard.py [port]
 Open: http://localhost:5050
+Prod: gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5050 intel_dashboard:app
 """
-import os
-import json
-from datetime import datetime
-from flask import Flask, render_template_string, request, jsonify
+import sys
+import gzip
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, stream_template, request, make_response, url_for
+
+try:
+    from flask_compress import Compress
+    HAS_COMPRESS = True
+except ImportError:
+    HAS_COMPRESS = False
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.jsonio import dumps_json
 
 from intel_database import (
-    get_connection, get_stats, get_agent_posting_schedule,
+    DB_FILE, get_connection, get_stats, get_agent_posting_schedule,
     get_all_posting_schedules, query_agent, fetch_agent_stats,
-    get_trending_posts, get_hall_of_fame_posts, get_most_interactive_agents,
-    query_shillers, query_websites
+    get_trending_posts, query_shillers, query_websites
 )
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder='static')
 
-# HTML Template with embedded CSS and JS
+# The HTML page and JSON payloads are repetitive - gzip them for clients that accept it
+COMPRESS_MIMETYPES = ['text/html', 'application/json', 'text/css', 'application/javascript']
+app.config.update(
+    COMPRESS_MIN_SIZE=1024,
+    COMPRESS_LEVEL=6,
+    COMPRESS_MIMETYPES=COMPRESS_MIMETYPES,
+    COMPRESS_STREAMS=False,  # Compressing the streamed page would buffer it and lose the early flush
+    TEMPLATES_AUTO_RELOAD=False,
+)
+app.jinja_env.auto_reload = False  # Templates are compiled in-process - skip mtime checks
+
+if HAS_COMPRESS:
+    Compress(app)
+else:
+    @app.after_request
+    def gzip_response(response):
+        """Minimal stand-in for flask-compress when it isn't installed"""
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code >= 300
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESS_MIMETYPES
+                or not request.accept_encodings['gzip']):
+            return response
+        body = response.get_data()
+        if len(body) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(gzip.compress(body, compresslevel=app.config['COMPRESS_LEVEL']))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+# CSS/JS live in static/ - the URL carries a content hash, so browsers may cache them forever
+STATIC_DIR = Path(__file__).parent / 'static'
+STATIC_MAX_AGE = 365 * 24 * 3600
+ASSET_VERSIONS = {
+    path.name: hashlib.blake2b(path.read_bytes(), digest_size=8).hexdigest()
+    for path in STATIC_DIR.glob('*') if path.is_file()
+}
+
+
+@app.template_global()
+def asset_url(filename: str) -> str:
+    """URL for a static asset, versioned by its content hash"""
+    return url_for('static', filename=filename, v=ASSET_VERSIONS.get(filename))
+
+
+@app.after_request
+def cache_static(response):
+    """Versioned static assets never change under the same URL"""
+    if request.path.startswith(app.static_url_path + '/') and request.args.get('v'):
+        response.cache_control.no_cache = None  # send_static_file defaults to no-cache
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+
+# HTML Template (styles and scripts are in static/)
 DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
     <title>Intel Dashboard</title>
-    <style>
-        * { box-sizing: border-box; margin: 0; padding: 0; }
-        body {
-            font-family: 'SF Mono', 'Fira Code', monospace;
-            background: #0a0a0a;
-            color: #e0e0e0;
-            padding: 20px;
-            line-height: 1.6;
-        }
-        .container { max-width: 1400px; margin: 0 auto; }
-        h1 { color: #00ff88; margin-bottom: 10px; font-size: 1.8em; }
-        h2 { color: #00aaff; margin: 20px 0 10px; font-size: 1.3em; border-bottom: 1px solid #333; padding-bottom: 5px; }
-        h3 { color: #ffaa00; margin: 15px 0 8px; font-size: 1.1em; }
-
-        .stats-bar {
-            display: flex; gap: 20px; margin-bottom: 20px;
-            background: #1a1a1a; padding: 15px; border-radius: 8px;
-        }
-        .stat-box {
-            text-align: center; padding: 10px 20px;
-            background: #252525; border-radius: 6px;
-        }
-        .stat-value { font-size: 1.8em; color: #00ff88; font-weight: bold; }
-        .stat-label { font-size: 0.8em; color: #888; }
-
-        .tabs {
-            display: flex; gap: 5px; margin-bottom: 15px;
-            border-bottom: 2px solid #333; padding-bottom: 10px;
-        }
-        .tab {
-            padding: 8px 16px; background: #1a1a1a; border: none;
-            color: #888; cursor: pointer; border-radius: 6px 6px 0 0;
-            font-family: inherit; font-size: 0.9em;
-        }
-        .tab:hover { background: #252525; color: #fff; }
-        .tab.active { background: #00ff88; color: #000; }
-
-        .tab-content { display: none; }
-        .tab-content.active { display: block; }
-
-        table {
-            width: 100%; border-collapse: collapse;
-            background: #1a1a1a; border-radius: 8px; overflow: hidden;
-        }
-        th {
-            background: #252525; padding: 12px 10px; text-align: left;
-            color: #00aaff; cursor: pointer; font-size: 0.85em;
-            border-bottom: 2px solid #333;
-        }
-        th:hover { background: #333; }
-        th.sorted-asc::after { content: ' ▲'; color: #00ff88; }
-        th.sorted-desc::after { content: ' ▼'; color: #00ff88; }
-        td {
-            padding: 10px; border-bottom: 1px solid #252525;
-            font-size: 0.9em;
-        }
-        tr:hover { background: #252525; }
-
-        .agent-name { color: #00ff88; font-weight: bold; cursor: pointer; }
-        .agent-name:hover { text-decoration: underline; }
-
-        .badge {
-            display: inline-block; padding: 2px 8px; border-radius: 4px;
-            font-size: 0.75em; margin-left: 5px;
-        }
-        .badge-hyperactive { background: #ff4444; color: #fff; }
-        .badge-very-active { background: #ff8800; color: #fff; }
-        .badge-active { background: #ffcc00; color: #000; }
-        .badge-regular { background: #00aaff; color: #fff; }
-        .badge-casual { background: #888; color: #fff; }
-        .badge-shill { background: #ff00ff; color: #fff; }
-
-        .number { text-align: right; font-variant-numeric: tabular-nums; }
-        .positive { color: #00ff88; }
-        .negative { color: #ff4444; }
-
-        .search-box {
-            padding: 10px 15px; background: #1a1a1a; border: 1px solid #333;
-            border-radius: 6px; color: #fff; width: 300px; margin-bottom: 15px;
-            font-family: inherit;
-        }
-        .search-box:focus { outline: none; border-color: #00ff88; }
-
-        .modal {
-            display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%;
-            background: rgba(0,0,0,0.8); z-index: 1000; overflow-y: auto;
-        }
-        .modal.active { display: flex; justify-content: center; padding: 50px 20px; }
-        .modal-content {
-            background: #1a1a1a; border-radius: 12px; padding: 25px;
-            max-width: 800px; width: 100%; max-height: 90vh; overflow-y: auto;
-        }
-        .modal-close {
-            float: right; background: none; border: none; color: #888;
-            font-size: 1.5em; cursor: pointer;
-        }
-        .modal-close:hover { color: #ff4444; }
-
-        .detail-grid {
-            display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 15px; margin: 15px 0;
-        }
-        .detail-box {
-            background: #252525; padding: 15px; border-radius: 8px; text-align: center;
-        }
-        .detail-value { font-size: 1.4em; color: #00ff88; }
-        .detail-label { font-size: 0.8em; color: #888; margin-top: 5px; }
-
-        .post-list { margin-top: 15px; }
-        .post-item {
-            background: #252525; padding: 12px; border-radius: 6px; margin-bottom: 8px;
-        }
-        .post-content { color: #e0e0e0; margin-bottom: 8px; }
-        .post-meta { font-size: 0.8em; color: #888; }
-        .post-meta span { margin-right: 15px; }
-
-        .refresh-btn {
-            background: #00ff88; color: #000; border: none; padding: 8px 16px;
-            border-radius: 6px; cursor: pointer; font-family: inherit; font-weight: bold;
-        }
-        .refresh-btn:hover { background: #00cc66; }
-
-        @keyframes pulse { 0%, 100% { opacity: 1; } 50% { opacity: 0.5; } }
-        .loading { animation: pulse 1s infinite; }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('dashboard.css') }}">
+    <script src="{{ asset_url('dashboard.js') }}" defer></script>
 </head>
 <body>
     <div class="container">
@@ -185,30 +132,22 @@ DASHBOARD_HTML = """
         <!-- AGENTS TAB -->
         <div id="tab-agents" class="tab-content active">
             <input type="text" class="search-box" placeholder="Search agents..." onkeyup="filterAgents(this.value)">
-            <table id="agents-table">
-                <thead>
-                    <tr>
-                        <th onclick="sortTable('agents-table', 0)">Agent</th>
-                        <th onclick="sortTable('agents-table', 1)" class="number">Followers</th>
-                        <th onclick="sortTable('agents-table', 2)" class="number">Views</th>
-                        <th onclick="sortTable('agents-table', 3)" class="number">Posts</th>
-                        <th onclick="sortTable('agents-table', 4)" class="number">Likes</th>
-                        <th onclick="sortTable('agents-table', 5)">Last Seen</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {% for agent in agents %}
-                    <tr>
-                        <td><span class="agent-name" onclick="showAgentDetail('{{ agent.name }}')">{{ agent.avatar_emoji or '🤖' }} {{ agent.name }}</span></td>
-                        <td class="number">{{ agent.current_followers or 0 }}</td>
-                        <td class="number">{{ agent.current_views or 0 }}</td>
-                        <td class="number">{{ agent.current_posts or 0 }}</td>
-                        <td class="number">{{ agent.current_likes or 0 }}</td>
-                        <td>{{ agent.last_seen[:10] if agent.last_seen else 'Unknown' }}</td>
-                    </tr>
-                    {% endfor %}
-                </tbody>
-            </table>
+            <div id="agents-scroll" class="table-scroll">
+                <table id="agents-table">
+                    <thead>
+                        <tr>
+                            <th onclick="sortAgents(0)">Agent</th>
+                            <th onclick="sortAgents(1)" class="number">Followers</th>
+                            <th onclick="sortAgents(2)" class="number">Views</th>
+                            <th onclick="sortAgents(3)" class="number">Posts</th>
+                            <th onclick="sortAgents(4)" class="number">Likes</th>
+                            <th onclick="sortAgents(5)">Last Seen</th>
+                        </tr>
+                    </thead>
+                    <tbody></tbody>
+                </table>
+            </div>
+            <script id="agents-data" type="application/json">{{ agents_page|tojson }}</script>
         </div>
 
         <!-- SCHEDULES TAB -->
@@ -228,14 +167,14 @@ DASHBOARD_HTML = """
                 <tbody>
                     {% for s in schedules %}
                     <tr>
-                        <td><span class="agent-name" onclick="showAgentDetail('{{ s.agent }}')">{{ s.agent }}</span></td>
-                        <td class="number">{{ "%.1f"|format(s.avg_interval_minutes) }}m</td>
-                        <td class="number">{{ "%.1f"|format(s.posts_per_day) }}</td>
+                        <td><span class="agent-name" data-name="{{ s.agent }}">{{ s.agent }}</span></td>
+                        <td class="number" data-sort-value="{{ s.avg_interval_minutes }}">{{ "%.1f"|format(s.avg_interval_minutes) }}m</td>
+                        <td class="number" data-sort-value="{{ s.posts_per_day }}">{{ "%.1f"|format(s.posts_per_day) }}</td>
                         <td>
                             <span class="badge badge-{{ s.schedule_type }}">{{ s.schedule_type }}</span>
                         </td>
-                        <td class="number">{{ s.total_posts }}</td>
-                        <td class="number">{{ "%.1f"|format(s.active_days) }}</td>
+                        <td class="number" data-sort-value="{{ s.total_posts }}">{{ s.total_posts }}</td>
+                        <td class="number" data-sort-value="{{ s.active_days }}">{{ "%.1f"|format(s.active_days) }}</td>
                     </tr>
                     {% endfor %}
                 </tbody>
@@ -250,7 +189,7 @@ DASHBOARD_HTML = """
                 <div class="post-item">
                     <div class="post-content">{{ post.content[:200] }}{% if post.content|length > 200 %}...{% endif %}</div>
                     <div class="post-meta">
-                        <span class="agent-name" onclick="showAgentDetail('{{ post.agent_name }}')">@{{ post.agent_name }}</span>
+                        <span class="agent-name" data-name="{{ post.agent_name }}">@{{ post.agent_name }}</span>
                         <span>❤️ {{ post.likes }}</span>
                         <span>💬 {{ post.replies }}</span>
                         <span>🔁 {{ post.reposts }}</span>
@@ -274,7 +213,7 @@ DASHBOARD_HTML = """
                 <tbody>
                     {% for name, desc, conf in shillers %}
                     <tr>
-                        <td><span class="agent-name" onclick="showAgentDetail('{{ name }}')">@{{ name }}</span></td>
+                        <td><span class="agent-name" data-name="{{ name }}">@{{ name }}</span></td>
                         <td>{{ desc }}</td>
                         <td>{{ "%.0f"|format(conf * 100) }}%</td>
                     </tr>
@@ -311,200 +250,205 @@ DASHBOARD_HTML = """
             <div id="modal-body">Loading...</div>
         </div>
     </div>
-
-    <script>
-        function showTab(tabId) {
-            document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-            document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-            document.querySelector(`[onclick="showTab('${tabId}')"]`).classList.add('active');
-            document.getElementById('tab-' + tabId).classList.add('active');
-        }
-
-        function sortTable(tableId, colIndex) {
-            const table = document.getElementById(tableId);
-            const tbody = table.querySelector('tbody');
-            const rows = Array.from(tbody.querySelectorAll('tr'));
-            const th = table.querySelectorAll('th')[colIndex];
-            const isAsc = th.classList.contains('sorted-asc');
-
-            // Clear sort indicators
-            table.querySelectorAll('th').forEach(h => h.classList.remove('sorted-asc', 'sorted-desc'));
-
-            rows.sort((a, b) => {
-                let aVal = a.cells[colIndex].textContent.trim();
-                let bVal = b.cells[colIndex].textContent.trim();
-
-                // Try numeric sort
-                const aNum = parseFloat(aVal.replace(/[^0-9.-]/g, ''));
-                const bNum = parseFloat(bVal.replace(/[^0-9.-]/g, ''));
-
-                if (!isNaN(aNum) && !isNaN(bNum)) {
-                    return isAsc ? aNum - bNum : bNum - aNum;
-                }
-                return isAsc ? aVal.localeCompare(bVal) : bVal.localeCompare(aVal);
-            });
-
-            th.classList.add(isAsc ? 'sorted-desc' : 'sorted-asc');
-            rows.forEach(row => tbody.appendChild(row));
-        }
-
-        function filterAgents(query) {
-            const rows = document.querySelectorAll('#agents-table tbody tr');
-            query = query.toLowerCase();
-            rows.forEach(row => {
-                const name = row.cells[0].textContent.toLowerCase();
-                row.style.display = name.includes(query) ? '' : 'none';
-            });
-        }
-
-        function showAgentDetail(name) {
-            const modal = document.getElementById('agent-modal');
-            const body = document.getElementById('modal-body');
-            body.innerHTML = '<div class="loading">Loading agent data...</div>';
-            modal.classList.add('active');
-
-            fetch('/api/agent/' + encodeURIComponent(name))
-                .then(r => r.json())
-                .then(data => {
-                    if (data.error) {
-                        body.innerHTML = '<p style="color:#ff4444;">Error: ' + data.error + '</p>';
-                        return;
-                    }
-
-                    let html = `
-                        <h2>${data.avatar_emoji || '🤖'} ${data.display_name || data.name}</h2>
-                        <p style="color:#888;">@${data.name}</p>
-                        ${data.bio ? '<p style="margin:10px 0;">' + data.bio + '</p>' : ''}
-
-                        <div class="detail-grid">
-                            <div class="detail-box">
-                                <div class="detail-value">${data.current_followers || 0}</div>
-                                <div class="detail-label">Followers</div>
-                            </div>
-                            <div class="detail-box">
-                                <div class="detail-value">${data.current_views || 0}</div>
-                                <div class="detail-label">Views</div>
-                            </div>
-                            <div class="detail-box">
-                                <div class="detail-value">${data.current_posts || 0}</div>
-                                <div class="detail-label">Posts</div>
-                            </div>
-                            <div class="detail-box">
-                                <div class="detail-value">${data.current_likes || 0}</div>
-                                <div class="detail-label">Likes</div>
-                            </div>
-                        </div>
-                    `;
-
-                    if (data.schedule) {
-                        const s = data.schedule;
-                        html += `
-                            <h3>⏱️ Posting Schedule</h3>
-                            <div class="detail-grid">
-                                <div class="detail-box">
-                                    <div class="detail-value">${s.avg_interval_minutes ? s.avg_interval_minutes.toFixed(1) + 'm' : 'N/A'}</div>
-                                    <div class="detail-label">Avg Interval</div>
-                                </div>
-                                <div class="detail-box">
-                                    <div class="detail-value">${s.posts_per_day ? s.posts_per_day.toFixed(1) : 'N/A'}</div>
-                                    <div class="detail-label">Posts/Day</div>
-                                </div>
-                                <div class="detail-box">
-                                    <div class="detail-value"><span class="badge badge-${s.schedule_type}">${s.schedule_type}</span></div>
-                                    <div class="detail-label">Type</div>
-                                </div>
-                            </div>
-                        `;
-                    }
-
-                    if (data.recent_posts && data.recent_posts.length > 0) {
-                        html += '<h3>📝 Recent Posts</h3><div class="post-list">';
-                        data.recent_posts.slice(0, 5).forEach(post => {
-                            html += `
-                                <div class="post-item">
-                                    <div class="post-content">${(post.content || '').substring(0, 200)}${(post.content || '').length > 200 ? '...' : ''}</div>
-                                    <div class="post-meta">
-                                        <span>❤️ ${post.likes || 0}</span>
-                                        <span>💬 ${post.replies || 0}</span>
-                                        <span>${post.timestamp ? post.timestamp.substring(0, 10) : ''}</span>
-                                    </div>
-                                </div>
-                            `;
-                        });
-                        html += '</div>';
-                    }
-
-                    if (data.patterns && data.patterns.length > 0) {
-                        html += '<h3>🔍 Detected Patterns</h3><ul style="margin-left:20px;">';
-                        data.patterns.forEach(p => {
-                            html += `<li>${p.pattern_type}: ${p.description} (${Math.round(p.confidence * 100)}%)</li>`;
-                        });
-                        html += '</ul>';
-                    }
-
-                    if (data.websites && data.websites.length > 0) {
-                        html += '<h3>🌐 Websites</h3><ul style="margin-left:20px;">';
-                        data.websites.forEach(w => {
-                            html += `<li><a href="${w[1]}" target="_blank" style="color:#00aaff;">${w[0]}</a></li>`;
-                        });
-                        html += '</ul>';
-                    }
-
-                    body.innerHTML = html;
-                })
-                .catch(err => {
-                    body.innerHTML = '<p style="color:#ff4444;">Failed to load: ' + err + '</p>';
-                });
-        }
-
-        function closeModal() {
-            document.getElementById('agent-modal').classList.remove('active');
-        }
-
-        // Close modal on escape
-        document.addEventListener('keydown', e => { if (e.key === 'Escape') closeModal(); });
-    </script>
 </body>
 </html>
 """
 
+# Compiled once - render_template_string would re-parse the page on every request.
+# Built from app.jinja_env so autoescaping and context processors match render_template_string.
+DASHBOARD_TEMPLATE = app.jinja_env.from_string(DASHBOARD_HTML)
+
+
+# Agents table is served a page at a time, sorted/filtered by SQLite
+AGENTS_PAGE_SIZE = 100
+AGENTS_MAX_PAGE_SIZE = 500
+# Sortable columns (ORDER BY can't be parameterized - only these names reach the SQL)
+AGENT_SORT_COLUMNS = {'name', 'current_followers', 'current_views', 'current_posts', 'current_likes', 'last_seen'}
+
+
+def _agent_filter(query: str | None) -> tuple[str, list]:
+    """WHERE clause + params for a case-insensitive substring match on the name"""
+    if not query:
+        return '', []
+    pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    return "WHERE name LIKE ? ESCAPE '\\'", [pattern]
+
 
-def get_all_agents():
-    """Get all agents from database"""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute('''
-        SELECT name, display_name, avatar_emoji, bio, first_seen, last_seen,
-               current_followers, current_following, current_views, current_posts, current_likes
-        FROM agents
-        ORDER BY current_followers DESC
-    ''')
-    columns = ['name', 'display_name', 'avatar_emoji', 'bio', 'first_seen', 'last_seen',
-               'current_followers', 'current_following', 'current_views', 'current_posts', 'current_likes']
-    agents = [dict(zip(columns, row)) for row in c.fetchall()]
-    conn.close()
-    return agents
+def get_all_agents(limit: int = None, offset: int = 0,
+                   sort: str = 'current_followers', desc: bool = True, query: str = None):
+    """Get agents from database - optionally one page, sorted by a whitelisted column and filtered by name"""
+    if sort not in AGENT_SORT_COLUMNS:
+        raise ValueError(f"Unsortable column: {sort}")
+    order = 'DESC' if desc else 'ASC'
+    where, params = _agent_filter(query)
+    conn = get_connection(read_only=True)
+    try:
+        # Rows by column name straight from C - Jinja's agent.name falls back to row['name']
+        conn.row_factory = sqlite3.Row
+        # name breaks ties so pages don't overlap; (column, name) indexes serve this order
+        return conn.execute(f'''
+            SELECT name, display_name, avatar_emoji, bio, first_seen, last_seen,
+                   current_followers, current_following, current_views, current_posts, current_likes
+            FROM agents
+            {where}
+            ORDER BY {sort} {order}, name {order}
+            LIMIT ? OFFSET ?
+        ''', params + [-1 if limit is None else limit, offset]).fetchall()
+    finally:
+        conn.close()
+
+
+def count_agents(query: str = None) -> int:
+    """Number of agents matching a name filter"""
+    where, params = _agent_filter(query)
+    conn = get_connection(read_only=True)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM agents {where}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def agent_table_rows(agents) -> list:
+    """Compact [name, followers, views, posts, likes, last_seen, emoji] rows for the virtualized agents table"""
+    return [
+        [a['name'], a['current_followers'] or 0, a['current_views'] or 0, a['current_posts'] or 0,
+         a['current_likes'] or 0, a['last_seen'][:10] if a['last_seen'] else 'Unknown', a['avatar_emoji'] or '🤖']
+        for a in agents
+    ]
+
+
+# The page's queries are independent - run them side by side, each on its own connection
+DASHBOARD_QUERY_WORKERS = 6
+_query_pool = ThreadPoolExecutor(max_workers=DASHBOARD_QUERY_WORKERS)
+
+
+class LazyRows:
+    """Iterable over a query future - the template only waits when it reaches the loop"""
+
+    def __init__(self, future):
+        self._future = future
+
+    def __iter__(self):
+        return iter(self._future.result())
+
+
+# Query futures by data version: requests for the same data while it's being read share the
+# queries instead of each running all six (failed ones are retried by the next request)
+_page_queries = {}
+_page_lock = threading.Lock()
+PAGE_CACHE_SIZE = 4
+
+
+def _remember(cache: dict, key, value):
+    """Store value under key, dropping the oldest entries past PAGE_CACHE_SIZE (hold _page_lock)"""
+    cache[key] = value
+    while len(cache) > PAGE_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+
+
+def _dashboard_queries(etag: str) -> dict:
+    with _page_lock:
+        futures = _page_queries.get(etag)
+        if futures is None or any(f.done() and f.exception() for f in futures.values()):
+            futures = {
+                'stats': _query_pool.submit(get_stats),
+                'agents': _query_pool.submit(get_all_agents, limit=AGENTS_PAGE_SIZE),
+                'schedules': _query_pool.submit(get_all_posting_schedules, min_posts=3),
+                'trending': _query_pool.submit(get_trending_posts, min_likes=1, limit=20),
+                'shillers': _query_pool.submit(query_shillers),
+                'websites': _query_pool.submit(lambda: query_websites()[:20]),
+            }
+            _remember(_page_queries, etag, futures)
+    return futures
+
+
+def get_dashboard_context(etag: str) -> dict:
+    """
+    Everything the dashboard page shows. All six queries start at once on the pool
+    (or are joined, if a request for this data version already started them);
+    the header and agents tab wait for theirs, the other tabs' results are picked up
+    as the streamed render reaches them.
+    """
+    futures = _dashboard_queries(etag)
+    stats = futures['stats'].result()
+    return {
+        'stats': stats,
+        'agents_page': {
+            'total': stats['agents'],
+            'page_size': AGENTS_PAGE_SIZE,
+            'rows': agent_table_rows(futures['agents'].result()),
+        },
+        'schedules': LazyRows(futures['schedules']),
+        'trending': LazyRows(futures['trending']),
+        'shillers': LazyRows(futures['shillers']),
+        'websites': LazyRows(futures['websites']),
+    }
+
+
+def json_response(data, status: int = 200):
+    """JSON response encoded with orjson when available (jsonify always goes through stdlib json)"""
+    return app.response_class(dumps_json(data), status=status, mimetype='application/json')
+
+
+# Browsers may reuse a page/stats response this long before revalidating with the ETag
+DASHBOARD_MAX_AGE = 30
+
+
+def data_version() -> str:
+    """ETag for the database contents - changes whenever a write lands (db or its WAL)"""
+    parts = []
+    for path in (DB_FILE, DB_FILE.with_name(DB_FILE.name + '-wal')):
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        # An empty WAL (opened by a reader, or just checkpointed) holds no data - same as none
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}" if st and st.st_size else '-')
+    return hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+
+
+def cached_response(etag: str, build):
+    """304 if the client already has this version, else build() with ETag + Cache-Control set"""
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+    response.set_etag(etag)
+    response.cache_control.max_age = DASHBOARD_MAX_AGE
+    return response
+
+
+# Rendered pages by data version - repeat requests for the same data skip the queries and render
+_page_cache = {}
+
+
+def _stream_dashboard(etag: str, chunks):
+    """Pass the rendered chunks through, keeping the finished HTML for the next request"""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    with _page_lock:
+        _remember(_page_cache, etag, ''.join(parts))
+        _page_queries.pop(etag, None)
+
+
+def _dashboard_page(etag: str):
+    with _page_lock:
+        cached = _page_cache.get(etag)
+    if cached is not None:
+        return cached
+    # stream_template must be called inside the view: it binds the request context to the
+    # generator, which the server only starts reading after the view has returned
+    chunks = stream_template(DASHBOARD_TEMPLATE, **get_dashboard_context(etag))
+    return app.response_class(_stream_dashboard(etag, chunks), mimetype='text/html')
 
 
 @app.route('/')
 def dashboard():
     """Main dashboard page"""
-    stats = get_stats()
-    agents = get_all_agents()
-    schedules = get_all_posting_schedules(min_posts=3)
-    trending = get_trending_posts(min_likes=1, limit=20)
-    shillers = query_shillers()
-    websites = query_websites()[:20]
-
-    return render_template_string(
-        DASHBOARD_HTML,
-        stats=stats,
-        agents=agents,
-        schedules=schedules,
-        trending=trending,
-        shillers=shillers,
-        websites=websites
-    )
+    etag = data_version()
+    return cached_response(etag, lambda: _dashboard_page(etag))
 
 
 @app.route('/api/agent/<name>')
@@ -513,21 +457,40 @@ def api_agent(name):
     try:
         agent = query_agent(name)
         if not agent:
-            return jsonify({'error': 'Agent not found'}), 404
+            return json_response({'error': 'Agent not found'}, 404)
 
         # Add schedule
         schedule = get_agent_posting_schedule(name)
         agent['schedule'] = schedule
 
-        return jsonify(agent)
+        return json_response(agent)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+
+@app.route('/api/agents')
+def api_agents():
+    """One page of the agents table: ?sort=<column>&order=asc|desc&q=<name filter>&offset=&limit="""
+    sort = request.args.get('sort', 'current_followers')
+    if sort not in AGENT_SORT_COLUMNS:
+        return json_response({'error': f'Unsortable column: {sort}'}, 400)
+    desc = request.args.get('order', 'desc') != 'asc'
+    query = request.args.get('q', '').strip() or None
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', AGENTS_PAGE_SIZE, type=int), 1), AGENTS_MAX_PAGE_SIZE)
+
+    def build():
+        total = _query_pool.submit(count_agents, query)
+        rows = get_all_agents(limit=limit, offset=offset, sort=sort, desc=desc, query=query)
+        return json_response({'total': total.result(), 'rows': agent_table_rows(rows)})
+
+    return cached_response(data_version(), build)
 
 
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for database stats"""
-    return jsonify(get_stats())
+    return cached_response(data_version(), lambda: json_response(get_stats()))
 
 
 @app.route('/api/refresh/<name>')
@@ -535,13 +498,12 @@ def api_refresh(name):
     """Fetch fresh stats from MoltX API"""
     try:
         stats = fetch_agent_stats(name)
-        return jsonify(stats)
+        return json_response(stats)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 if __name__ == '__main__':
-    import sys
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 5050
 
     print("\n" + "="*50)
@@ -550,4 +512,5 @@ if __name__ == '__main__':
     print(f"\nOpen in browser: http://localhost:{port}")
     print("Press Ctrl+C to stop\n")
 
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # No debugger/reloader (they wrap every request); threads let the page's queries overlap
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
@@ -17,6 +17,7 @@ import sqlite3
 import json
 import logging
 from pathlib import Path
+from contextlib import contextmanager
 from datetime import datetime
 from dotenv import load_dotenv
 import requests
@@ -59,9 +60,51 @@ class C:
     END = '\033[0m'
 
 
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(DB_FILE, timeout=30)
+# Per-connection tuning: 256MB mmap window, 64MB page cache, temp tables in memory.
+# synchronous=NORMAL is durable enough under WAL (a crash can only lose the last commits).
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA temp_store=MEMORY',
+)
+
+
+def get_connection(read_only: bool = False):
+    """
+    Get database connection (WAL + tuning pragmas applied).
+    read_only opens with mode=ro so SQLite skips the write-lock machinery; it falls back to a
+    normal connection if the file can't be opened that way (e.g. no WAL index exists yet).
+    """
+    conn = None
+    if read_only:
+        try:
+            conn = sqlite3.connect(f"{DB_FILE.as_uri()}?mode=ro", uri=True, timeout=30)
+            conn.execute('SELECT 1 FROM sqlite_master LIMIT 1')
+        except sqlite3.OperationalError:
+            if conn is not None:
+                conn.close()
+            conn = None
+    if conn is None:
+        conn = sqlite3.connect(DB_FILE, timeout=30)
+        # Persistent on the file: readers don't block each other or the ingester
+        conn.execute('PRAGMA journal_mode=WAL')
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+@contextmanager
+def _use_connection(conn=None):
+    """Use the caller's connection if given (they close it), else open a read-only one for the block"""
+    if conn is not None:
+        yield conn
+        return
+    conn = get_connection(read_only=True)
+    try:
+        yield conn
+    finally:
+        conn.close()
 
 
 def init_database():
@@ -229,6 +272,9 @@ def init_database():
     # Create indexes
     c.execute('CREATE INDEX IF NOT EXISTS idx_posts_agent ON posts(agent_name)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts(timestamp)')
+    # Dashboard pages through agents by these columns (name breaks ties)
+    for column in ('current_followers', 'current_views', 'current_posts', 'current_likes', 'last_seen'):
+        c.execute(f'CREATE INDEX IF NOT EXISTS idx_agents_{column} ON agents({column}, name)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_snapshots_agent ON agent_snapshots(agent_name)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_websites_domain ON websites(domain)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_patterns_type ON patterns(pattern_type)')
@@ -834,26 +880,15 @@ def analyze_patterns():
 
 
 def get_stats():
-    """Get database statistics"""
-    conn = get_connection()
-    c = conn.cursor()
-
-    c.execute('SELECT COUNT(*) FROM agents')
-    agents = c.fetchone()[0]
-
-    c.execute('SELECT COUNT(*) FROM posts')
-    posts = c.fetchone()[0]
-
-    c.execute('SELECT COUNT(*) FROM websites')
-    websites = c.fetchone()[0]
-
-    c.execute('SELECT COUNT(*) FROM patterns')
-    patterns = c.fetchone()[0]
-
-    c.execute('SELECT COUNT(DISTINCT domain) FROM websites')
-    domains = c.fetchone()[0]
-
-    conn.close()
+    """Get database statistics (all counts in one query)"""
+    with _use_connection() as conn:
+        agents, posts, websites, patterns, domains = conn.execute('''
+            SELECT (SELECT COUNT(*) FROM agents),
+                   (SELECT COUNT(*) FROM posts),
+                   (SELECT COUNT(*) FROM websites),
+                   (SELECT COUNT(*) FROM patterns),
+                   (SELECT COUNT(DISTINCT domain) FROM websites)
+        ''').fetchone()
 
     return {
         'agents': agents,
@@ -893,7 +928,7 @@ def run_intel_cycle():
 
 def query_agent(name: str) -> dict:
     """Get all info about an agent"""
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     c = conn.cursor()
 
     c.execute('SELECT * FROM agents WHERE name = ?', (name,))
@@ -925,17 +960,13 @@ def query_agent(name: str) -> dict:
 
 def query_shillers() -> list:
     """Find agents who shill a lot"""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute('''
-        SELECT DISTINCT agent_name, description, confidence
-        FROM patterns
-        WHERE pattern_type = 'shill'
-        ORDER BY confidence DESC
-    ''')
-    results = c.fetchall()
-    conn.close()
-    return results
+    with _use_connection() as conn:
+        return conn.execute('''
+            SELECT DISTINCT agent_name, description, confidence
+            FROM patterns
+            WHERE pattern_type = 'shill'
+            ORDER BY confidence DESC
+        ''').fetchall()
 
 
 def query_repetitive() -> list:
@@ -955,19 +986,15 @@ def query_repetitive() -> list:
 
 def query_websites() -> list:
     """Find all websites shared"""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute('''
-        SELECT domain, COUNT(DISTINCT agent_name) as agents, SUM(times_shared) as shares
-        FROM websites
-        WHERE domain NOT LIKE '%moltx%'
-        GROUP BY domain
-        ORDER BY shares DESC
-        LIMIT 50
-    ''')
-    results = c.fetchall()
-    conn.close()
-    return results
+    with _use_connection() as conn:
+        return conn.execute('''
+            SELECT domain, COUNT(DISTINCT agent_name) as agents, SUM(times_shared) as shares
+            FROM websites
+            WHERE domain NOT LIKE '%moltx%'
+            GROUP BY domain
+            ORDER BY shares DESC
+            LIMIT 50
+        ''').fetchall()
 
 
 def query_interesting_agents() -> list:
@@ -1071,19 +1098,16 @@ def get_agent_stats(name: str) -> dict:
 
 def get_trending_posts(min_likes: int = 3, limit: int = 20) -> list:
     """Get high-engagement posts for view maximizing"""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute('''
-        SELECT id, agent_name, content, timestamp, likes, replies, reposts, views
-        FROM posts
-        WHERE likes >= ?
-        ORDER BY likes DESC, replies DESC
-        LIMIT ?
-    ''', (min_likes, limit))
+    with _use_connection() as conn:
+        rows = conn.execute('''
+            SELECT id, agent_name, content, timestamp, likes, replies, reposts, views
+            FROM posts
+            WHERE likes >= ?
+            ORDER BY likes DESC, replies DESC
+            LIMIT ?
+        ''', (min_likes, limit)).fetchall()
     columns = ['id', 'agent_name', 'content', 'timestamp', 'likes', 'replies', 'reposts', 'views']
-    results = [dict(zip(columns, row)) for row in c.fetchall()]
-    conn.close()
-    return results
+    return [dict(zip(columns, row)) for row in rows]
 
 
 def get_hall_of_fame_posts(min_engagement: int = 5, limit: int = 50) -> list:
@@ -1182,20 +1206,18 @@ def get_hall_of_fame() -> list:
     return results
 
 
-def get_agent_posting_schedule(name: str) -> dict:
+def get_agent_posting_schedule(name: str, conn=None) -> dict:
     """Calculate an agent's posting schedule/frequency"""
-    conn = get_connection()
-    c = conn.cursor()
-
     # Get all post timestamps for this agent, ordered
-    c.execute('''
-        SELECT timestamp FROM posts
-        WHERE agent_name = ? AND timestamp IS NOT NULL AND timestamp != ''
-        ORDER BY timestamp ASC
-    ''', (name,))
+    with _use_connection(conn) as conn:
+        rows = conn.execute('''
+            SELECT timestamp FROM posts
+            WHERE agent_name = ? AND timestamp IS NOT NULL AND timestamp != ''
+            ORDER BY timestamp ASC
+        ''', (name,)).fetchall()
 
     timestamps = []
-    for row in c.fetchall():
+    for row in rows:
         try:
             # Parse ISO timestamp
             ts = row[0]
@@ -1207,8 +1229,6 @@ def get_agent_posting_schedule(name: str) -> dict:
         except:
             continue
 
-    conn.close()
-
     if len(timestamps) < 2:
         return {
             'agent': name,
@@ -1278,27 +1298,23 @@ def get_agent_posting_schedule(name: str) -> dict:
 
 def get_all_posting_schedules(min_posts: int = 5) -> list:
     """Get posting schedules for all agents with enough data"""
-    conn = get_connection()
-    c = conn.cursor()
-
-    # Get agents with enough posts
-    c.execute('''
-        SELECT agent_name, COUNT(*) as post_count
-        FROM posts
-        WHERE agent_name IS NOT NULL AND agent_name != ''
-        GROUP BY agent_name
-        HAVING post_count >= ?
-        ORDER BY post_count DESC
-    ''', (min_posts,))
-
-    agents = [row[0] for row in c.fetchall()]
-    conn.close()
-
-    schedules = []
-    for agent in agents:
-        schedule = get_agent_posting_schedule(agent)
-        if schedule.get('avg_interval_hours'):
-            schedules.append(schedule)
+    with _use_connection() as conn:
+        # Get agents with enough posts
+        agents = [row[0] for row in conn.execute('''
+            SELECT agent_name, COUNT(*) as post_count
+            FROM posts
+            WHERE agent_name IS NOT NULL AND agent_name != ''
+            GROUP BY agent_name
+            HAVING post_count >= ?
+            ORDER BY post_count DESC
+        ''', (min_posts,))]
+
+        # One connection for every agent's schedule instead of one each
+        schedules = []
+        for agent in agents:
+            schedule = get_agent_posting_schedule(agent, conn)
+            if schedule.get('avg_interval_hours'):
+                schedules.append(schedule)
 
     # Sort by posts per day (most active first)
     schedules.sort(key=lambda x: x.get('posts_per_day', 0), reverse=True)
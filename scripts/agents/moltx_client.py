@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+MoltX Client - shared HTTP plumbing for the follow scripts
+- One keep-alive session and one rate limiter for every caller in the process
+- follow / unfollow / DM helpers (DM conversation ids cached)
+- Follower names from /notifications, cached briefly across callers
+"""
+import os
+import sys
+import time
+import random
+from pathlib import Path
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.rate_limit import RateLimiter
+from utils.jsonio import loads_json, load_json, save_json
+from utils.http_session import make_session, TRANSIENT_ERRORS, REQUEST_ERRORS
+from utils.conv_cache import get_conv_id, remember_conv_id, forget_conv_id
+
+# Load .env here rather than trusting the importer to have done it first - HEADERS is built once
+load_dotenv(Path(__file__).parent.parent.parent / ".env")
+
+API_KEY = os.environ.get("MOLTX_API_KEY")
+BASE = "https://moltx.io/v1"
+HEADERS = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
+SESSION = make_session(HEADERS)  # Keep-alive pool shared by every MoltX call
+
+# Throttle from the API's own rate limit headers instead of fixed sleeps
+RATE_LIMITER = RateLimiter()
+MAX_RETRIES = 3
+# Failures a helper reports and shrugs off; anything else is a bug and propagates
+HTTP_ERRORS = REQUEST_ERRORS + (ValueError,)  # ValueError: undecodable body
+
+# /notifications barely changes within a cycle - share one fetch across callers
+NOTIF_CACHE_FILE = Path(__file__).parent.parent.parent / "config" / ".notif_cache.json"
+NOTIF_CACHE_TTL = 30  # seconds
+NOTIF_ENDPOINT = "/notifications?limit=100"
+
+
+def api_request(method: str, url: str, **kwargs):
+    """
+    Send a MoltX request through the rate limiter.
+    Timeouts/connection errors are retried with jittered backoff and 429s after
+    Retry-After; the last error is raised to the caller.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        RATE_LIMITER.acquire()
+        try:
+            r = SESSION.request(method, url, **kwargs)
+        except TRANSIENT_ERRORS:
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(min(0.3 * 2 ** attempt, 4) + random.random() * 0.3)
+            continue
+        RATE_LIMITER.update(r)
+        if r.status_code != 429 or attempt == MAX_RETRIES:
+            return r
+        RATE_LIMITER.block_until(time.time() + RATE_LIMITER.retry_delay(r, attempt))
+    return r
+
+def _cached_notif_followers() -> set | None:
+    """Follower names from a fresh-enough cached /notifications fetch, else None."""
+    try:
+        entry = load_json(NOTIF_CACHE_FILE).get(NOTIF_ENDPOINT, {})
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("ts", 0) < NOTIF_CACHE_TTL:
+        return set(entry.get("followers", []))
+    return None
+
+def _cache_notif_followers(followers: set):
+    """Remember follower names from a successful /notifications fetch."""
+    try:
+        cache = load_json(NOTIF_CACHE_FILE)
+    except (OSError, ValueError):
+        cache = {}
+    cache[NOTIF_ENDPOINT] = {"ts": time.time(), "followers": sorted(followers)}
+    save_json(NOTIF_CACHE_FILE, cache, indent=False)
+
+def get_notification_followers(force: bool = False) -> set:
+    """Names of agents with a follow notification (cached for NOTIF_CACHE_TTL unless force)"""
+    if not force:
+        cached = _cached_notif_followers()
+        if cached is not None:
+            return cached
+    try:
+        r = api_request("GET", f"{BASE}{NOTIF_ENDPOINT}", timeout=15)
+        if r.status_code != 200:
+            return set()
+        notifs = loads_json(r.content).get("data", {}).get("notifications", [])
+        followers = set()
+        for n in notifs:
+            if n.get("type") == "follow":
+                name = n.get("actor", {}).get("name")
+                if name:
+                    followers.add(name)
+        _cache_notif_followers(followers)
+        return followers
+    except HTTP_ERRORS as e:
+        print(f"Notifications fetch error: {e}")
+        return set()
+
+def follow_agent(name: str) -> bool:
+    """Follow an agent"""
+    try:
+        r = api_request("POST", f"{BASE}/follow/{name}", timeout=5)
+        return r.status_code in [200, 201]
+    except HTTP_ERRORS as e:
+        print(f"Follow error (@{name}): {e}")
+        return False
+
+def unfollow_agent(name: str) -> bool:
+    """Unfollow an agent"""
+    try:
+        r = api_request("DELETE", f"{BASE}/follow/{name}", timeout=5)
+        return r.status_code in [200, 204]
+    except HTTP_ERRORS as e:
+        print(f"Unfollow error (@{name}): {e}")
+        return False
+
+def _create_conversation(to_agent: str) -> str | None:
+    """Create a DM conversation with to_agent and cache its id"""
+    r = api_request(
+        "POST",
+        f"{BASE}/conversations",
+        json={
+            "type": "dm",
+            "participant_handles": [to_agent]
+        },
+        timeout=10
+    )
+    if r.status_code in [200, 201]:
+        conv_id = loads_json(r.content).get("data", {}).get("conversation", {}).get("id")
+        if conv_id:
+            remember_conv_id(to_agent, conv_id)
+        return conv_id
+    return None
+
+def _post_message(conv_id: str, message: str):
+    return api_request(
+        "POST",
+        f"{BASE}/conversations/{conv_id}/messages",
+        json={"content": message},
+        timeout=10
+    )
+
+def send_dm(to_agent: str, message: str) -> bool:
+    """Send a DM to an agent (reuses the cached conversation when there is one)"""
+    try:
+        conv_id = get_conv_id(to_agent) or _create_conversation(to_agent)
+        if not conv_id:
+            return False
+        r = _post_message(conv_id, message)
+        if r.status_code == 404:
+            # Cached conversation is gone - recreate once
+            forget_conv_id(to_agent)
+            conv_id = _create_conversation(to_agent)
+            if not conv_id:
+                return False
+            r = _post_message(conv_id, message)
+        return r.status_code in [200, 201]
+    except HTTP_ERRORS as e:
+        print(f"DM error (@{to_agent}): {e}")
+    return False
@@ -0,0 +1,282 @@
+function showTab(tabId) {
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
+    document.querySelector(`[onclick="showTab('${tabId}')"]`).classList.add('active');
+    document.getElementById('tab-' + tabId).classList.add('active');
+    if (tabId === 'agents') queueRenderAgents();
+}
+
+function sortTable(tableId, colIndex) {
+    const table = document.getElementById(tableId);
+    const tbody = table.querySelector('tbody');
+    const th = table.querySelectorAll('th')[colIndex];
+    const isAsc = th.classList.contains('sorted-asc');
+
+    // Clear sort indicators
+    table.querySelectorAll('th').forEach(h => h.classList.remove('sorted-asc', 'sorted-desc'));
+
+    // Read each cell once up front - the comparator only touches these keys, never the DOM.
+    // Numeric cells carry data-sort-value so they need no text parsing.
+    const keys = Array.from(tbody.rows, row => {
+        const cell = row.cells[colIndex];
+        const str = cell.textContent.trim();
+        const num = cell.dataset.sortValue !== undefined
+            ? parseFloat(cell.dataset.sortValue)
+            : parseFloat(str.replace(/[^0-9.-]/g, ''));
+        return {row, num, str};
+    });
+
+    keys.sort((a, b) => {
+        if (!isNaN(a.num) && !isNaN(b.num)) {
+            return isAsc ? a.num - b.num : b.num - a.num;
+        }
+        return isAsc ? a.str.localeCompare(b.str) : b.str.localeCompare(a.str);
+    });
+
+    th.classList.add(isAsc ? 'sorted-desc' : 'sorted-asc');
+    tbody.append(...keys.map(k => k.row));
+}
+
+// Agents table: rows are [name, followers, views, posts, likes, last_seen, emoji].
+// The server sorts, filters and pages (/api/agents); the page ships with the first page.
+// Only the rows in view are rendered, and pages are fetched as they scroll into view.
+const AGENT_OVERSCAN = 10;
+const AGENT_SORT_KEYS = ['name', 'current_followers', 'current_views', 'current_posts', 'current_likes', 'last_seen'];
+const agentsInit = JSON.parse(document.getElementById('agents-data').textContent);
+const AGENT_PAGE_SIZE = agentsInit.page_size;
+let agentTotal = agentsInit.total;
+let agentPages = new Map([[0, agentsInit.rows]]);
+let agentLoading = new Set();
+let agentSort = {key: 'current_followers', order: 'desc'};
+let agentQuery = '';
+let agentGeneration = 0;  // Bumped on sort/filter so stale page fetches are dropped
+let agentRowHeight = 42;
+let agentRenderQueued = false;
+let agentFilterTimer = null;
+
+function escapeHtml(s) {
+    return String(s).replace(/[&<>"']/g, ch => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[ch]));
+}
+
+// Only http(s) links from the API make it into an href
+function safeUrl(url) {
+    return /^https?:\/\//i.test(String(url)) ? escapeHtml(url) : '#';
+}
+
+function agentSpacer(height) {
+    return height > 0 ? `<tr class="spacer"><td colspan="6" style="height:${height}px"></td></tr>` : '';
+}
+
+function fetchAgentPage(page) {
+    if (agentPages.has(page) || agentLoading.has(page)) return;
+    agentLoading.add(page);
+    const generation = agentGeneration;
+    const params = new URLSearchParams({
+        sort: agentSort.key, order: agentSort.order,
+        offset: page * AGENT_PAGE_SIZE, limit: AGENT_PAGE_SIZE,
+    });
+    if (agentQuery) params.set('q', agentQuery);
+
+    fetch('/api/agents?' + params)
+        .then(r => r.json())
+        .then(data => {
+            if (generation !== agentGeneration) return;
+            agentLoading.delete(page);
+            if (data.error) return;
+            agentTotal = data.total;
+            agentPages.set(page, data.rows);
+            queueRenderAgents();
+        })
+        .catch(() => { if (generation === agentGeneration) agentLoading.delete(page); });
+}
+
+function renderAgents() {
+    agentRenderQueued = false;
+    const wrap = document.getElementById('agents-scroll');
+    const tbody = document.querySelector('#agents-table tbody');
+    const first = Math.max(0, Math.floor(wrap.scrollTop / agentRowHeight) - AGENT_OVERSCAN);
+    const last = Math.min(agentTotal, first + Math.ceil(wrap.clientHeight / agentRowHeight) + 2 * AGENT_OVERSCAN);
+
+    let html = agentSpacer(first * agentRowHeight);
+    for (let i = first; i < last; i++) {
+        const page = Math.floor(i / AGENT_PAGE_SIZE);
+        const rows = agentPages.get(page);
+        if (!rows || !rows[i % AGENT_PAGE_SIZE]) {
+            fetchAgentPage(page);
+            html += '<tr><td colspan="6" class="loading">Loading...</td></tr>';
+            continue;
+        }
+        const [name, followers, views, posts, likes, lastSeen, emoji] = rows[i % AGENT_PAGE_SIZE];
+        html += `<tr>
+            <td><span class="agent-name" data-name="${escapeHtml(name)}">${escapeHtml(emoji)} ${escapeHtml(name)}</span></td>
+            <td class="number">${followers}</td>
+            <td class="number">${views}</td>
+            <td class="number">${posts}</td>
+            <td class="number">${likes}</td>
+            <td>${escapeHtml(lastSeen)}</td>
+        </tr>`;
+    }
+    html += agentSpacer((agentTotal - last) * agentRowHeight);
+    tbody.innerHTML = html;
+
+    // Spacer heights assume a row height - measure a real row once and redraw if it's off
+    const row = tbody.querySelector('tr:not(.spacer)');
+    if (row && Math.abs(row.offsetHeight - agentRowHeight) > 1) {
+        agentRowHeight = row.offsetHeight;
+        renderAgents();
+    }
+}
+
+function queueRenderAgents() {
+    if (!agentRenderQueued) {
+        agentRenderQueued = true;
+        requestAnimationFrame(renderAgents);
+    }
+}
+
+function resetAgentsView() {
+    agentGeneration++;
+    agentPages = new Map();
+    agentLoading = new Set();
+    document.getElementById('agents-scroll').scrollTop = 0;
+    fetchAgentPage(0);
+    renderAgents();
+}
+
+function sortAgents(colIndex) {
+    const th = document.querySelectorAll('#agents-table th')[colIndex];
+    const isAsc = th.classList.contains('sorted-asc');
+    document.querySelectorAll('#agents-table th').forEach(h => h.classList.remove('sorted-asc', 'sorted-desc'));
+
+    agentSort = {key: AGENT_SORT_KEYS[colIndex], order: isAsc ? 'desc' : 'asc'};
+    th.classList.add(isAsc ? 'sorted-desc' : 'sorted-asc');
+    resetAgentsView();
+}
+
+function filterAgents(query) {
+    // Wait for a pause in typing before asking the server
+    clearTimeout(agentFilterTimer);
+    agentFilterTimer = setTimeout(() => {
+        query = query.trim();
+        if (query === agentQuery) return;
+        agentQuery = query;
+        resetAgentsView();
+    }, 200);
+}
+
+document.getElementById('agents-scroll').addEventListener('scroll', queueRenderAgents, {passive: true});
+window.addEventListener('resize', queueRenderAgents);
+renderAgents();
+
+// One listener for every agent link on the page (names ride in data-name, autoescaped)
+document.addEventListener('click', e => {
+    const link = e.target.closest('.agent-name[data-name]');
+    if (link) showAgentDetail(link.dataset.name);
+});
+
+function showAgentDetail(name) {
+    const modal = document.getElementById('agent-modal');
+    const body = document.getElementById('modal-body');
+    body.innerHTML = '<div class="loading">Loading agent data...</div>';
+    modal.classList.add('active');
+
+    fetch('/api/agent/' + encodeURIComponent(name))
+        .then(r => r.json())
+        .then(data => {
+            if (data.error) {
+                body.innerHTML = '<p style="color:#ff4444;">Error: ' + escapeHtml(data.error) + '</p>';
+                return;
+            }
+
+            let html = `
+                <h2>${escapeHtml(data.avatar_emoji || '🤖')} ${escapeHtml(data.display_name || data.name)}</h2>
+                <p style="color:#888;">@${escapeHtml(data.name)}</p>
+                ${data.bio ? '<p style="margin:10px 0;">' + escapeHtml(data.bio) + '</p>' : ''}
+
+                <div class="detail-grid">
+                    <div class="detail-box">
+                        <div class="detail-value">${data.current_followers || 0}</div>
+                        <div class="detail-label">Followers</div>
+                    </div>
+                    <div class="detail-box">
+                        <div class="detail-value">${data.current_views || 0}</div>
+                        <div class="detail-label">Views</div>
+                    </div>
+                    <div class="detail-box">
+                        <div class="detail-value">${data.current_posts || 0}</div>
+                        <div class="detail-label">Posts</div>
+                    </div>
+                    <div class="detail-box">
+                        <div class="detail-value">${data.current_likes || 0}</div>
+                        <div class="detail-label">Likes</div>
+                    </div>
+                </div>
+            `;
+
+            if (data.schedule) {
+                const s = data.schedule;
+                html += `
+                    <h3>⏱️ Posting Schedule</h3>
+                    <div class="detail-grid">
+                        <div class="detail-box">
+                            <div class="detail-value">${s.avg_interval_minutes ? s.avg_interval_minutes.toFixed(1) + 'm' : 'N/A'}</div>
+                            <div class="detail-label">Avg Interval</div>
+                        </div>
+                        <div class="detail-box">
+                            <div class="detail-value">${s.posts_per_day ? s.posts_per_day.toFixed(1) : 'N/A'}</div>
+                            <div class="detail-label">Posts/Day</div>
+                        </div>
+                        <div class="detail-box">
+                            <div class="detail-value"><span class="badge badge-${escapeHtml(s.schedule_type)}">${escapeHtml(s.schedule_type)}</span></div>
+                            <div class="detail-label">Type</div>
+                        </div>
+                    </div>
+                `;
+            }
+
+            if (data.recent_posts && data.recent_posts.length > 0) {
+                html += '<h3>📝 Recent Posts</h3><div class="post-list">';
+                data.recent_posts.slice(0, 5).forEach(post => {
+                    html += `
+                        <div class="post-item">
+                            <div class="post-content">${escapeHtml((post.content || '').substring(0, 200))}${(post.content || '').length > 200 ? '...' : ''}</div>
+                            <div class="post-meta">
+                                <span>❤️ ${post.likes || 0}</span>
+                                <span>💬 ${post.replies || 0}</span>
+                                <span>${post.timestamp ? escapeHtml(post.timestamp.substring(0, 10)) : ''}</span>
+                            </div>
+                        </div>
+                    `;
+                });
+                html += '</div>';
+            }
+
+            if (data.patterns && data.patterns.length > 0) {
+                html += '<h3>🔍 Detected Patterns</h3><ul style="margin-left:20px;">';
+                data.patterns.forEach(p => {
+                    html += `<li>${escapeHtml(p.pattern_type)}: ${escapeHtml(p.description)} (${Math.round(p.confidence * 100)}%)</li>`;
+                });
+                html += '</ul>';
+            }
+
+            if (data.websites && data.websites.length > 0) {
+                html += '<h3>🌐 Websites</h3><ul style="margin-left:20px;">';
+                data.websites.forEach(w => {
+                    html += `<li><a href="${safeUrl(w[1])}" target="_blank" rel="noopener noreferrer" style="color:#00aaff;">${escapeHtml(w[0])}</a></li>`;
+                });
+                html += '</ul>';
+            }
+
+            body.innerHTML = html;
+        })
+        .catch(err => {
+            body.innerHTML = '<p style="color:#ff4444;">Failed to load: ' + escapeHtml(err) + '</p>';
+        });
+}
+
+function closeModal() {
+    document.getElementById('agent-modal').classList.remove('active');
+}
+
+// Close modal on escape
+document.addEventListener('keydown', e => { if (e.key === 'Escape') closeModal(); });
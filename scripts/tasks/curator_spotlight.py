@@ -48,7 +48,7 @@ class CuratorSpotlightTask(Task):
 
         # Get the top pick
         pick = all_time[0]
-        author = pick.get("author", "@SlopLauncher").lstrip("@")
+        author = pick.get("authorBare") or pick.get("author", "@SlopLauncher").lstrip("@")
         max_score = pick.get("maxScore", 0)
         content_preview = pick.get("content", "")[:80]
 
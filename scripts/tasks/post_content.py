@@ -160,7 +160,7 @@ Write ONE original post that sounds like a real cynical person, not a bot."""
                     data = json.load(f)
                     all_time = data.get("allTime", [])
                     if all_time:
-                        author = all_time[0].get("author", "@SlopLauncher").lstrip("@")
+                        author = all_time[0].get("authorBare") or all_time[0].get("author", "@SlopLauncher").lstrip("@")
         except:
             pass
 
@@ -1,2 +1,2 @@
 # Utils package
-from .llm_client import generate, chat, MODEL_ORIGINAL, MODEL_REPLY, MODEL_FAST
+from .llm_client import generate, chat, strip_quotes, MODEL_ORIGINAL, MODEL_REPLY, MODEL_FAST
@@ -0,0 +1,51 @@
+"""
+DM conversation id cache - handle -> MoltX conversation id.
+
+A DM conversation with an agent is stable once created, so repeat DMs can
+skip the POST /conversations round trip. Persisted to config/conv_ids.json
+and shared by every script that sends DMs.
+"""
+
+import threading
+from pathlib import Path
+
+from utils.jsonio import load_json, save_json
+
+MOLTX_DIR = Path(__file__).parent.parent.parent
+CONV_CACHE_FILE = MOLTX_DIR / "config" / "conv_ids.json"
+
+_cache = None
+_lock = threading.Lock()
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        try:
+            _cache = load_json(CONV_CACHE_FILE)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def get_conv_id(handle: str) -> str | None:
+    """Cached conversation id for a DM with handle, if any."""
+    with _lock:
+        return _load().get(handle)
+
+
+def remember_conv_id(handle: str, conv_id: str):
+    """Store the conversation id for a DM with handle."""
+    with _lock:
+        cache = _load()
+        if cache.get(handle) != conv_id:
+            cache[handle] = conv_id
+            save_json(CONV_CACHE_FILE, cache)
+
+
+def forget_conv_id(handle: str):
+    """Drop a stale conversation id (e.g. the conversation 404'd)."""
+    with _lock:
+        cache = _load()
+        if cache.pop(handle, None) is not None:
+            save_json(CONV_CACHE_FILE, cache)
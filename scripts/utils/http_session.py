@@ -0,0 +1,60 @@
+"""
+HTTP session factory for MoltX API calls.
+
+Prefers an HTTP/2 httpx client (concurrent requests multiplex over one
+connection, headers are HPACK-compressed) when httpx[http2] is installed,
+otherwise a pooled keep-alive requests.Session. Both expose the
+get/post -> status_code/json()/text surface the callers use.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# Network-level failures worth retrying, whichever client make_session returned
+TRANSIENT_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+# Any failure of the request itself (transient or not) - what callers that shrug off errors catch
+REQUEST_ERRORS = (requests.exceptions.RequestException,)
+if HAS_HTTP2:
+    TRANSIENT_ERRORS += (httpx.TransportError,)
+    REQUEST_ERRORS += (httpx.HTTPError,)
+
+
+def make_session(headers: dict, pool_size: int = 16):
+    """
+    Build a shared client for MoltX calls.
+
+    Args:
+        headers: Default headers (Authorization etc.)
+        pool_size: Max pooled connections - keep >= any thread pool using it
+
+    Returns:
+        httpx.Client(http2=True) if available, else a requests.Session
+    """
+    if HAS_HTTP2:
+        return httpx.Client(
+            headers=headers,
+            timeout=10,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=2,  # Connection-level retries
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            )
+        )
+
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        # Connection-level retries only (like the httpx transport) - status codes are the caller's call
+        max_retries=Retry(total=2, backoff_factor=0.3, respect_retry_after_header=False, raise_on_status=False)
+    ))
+    return session
@@ -0,0 +1,58 @@
+"""
+JSON file helpers.
+Uses orjson when it's installed (several times faster on dict-heavy files),
+otherwise the stdlib json module.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def loads_json(data: bytes | str):
+    """Decode JSON bytes/str (e.g. a response body's .content)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(data) -> bytes:
+    """Encode data as compact JSON bytes (one JSONL record, say)."""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def load_json(path: Path):
+    """Read and decode a JSON file in one read."""
+    return loads_json(Path(path).read_bytes())
+
+
+def save_json(path: Path, data, indent: bool = True):
+    """
+    Atomically write data as JSON: write a temp file, then os.replace() it over path.
+    A crash mid-write leaves the previous file intact instead of a truncated one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    if HAS_ORJSON:
+        tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+    else:
+        tmp.write_text(json.dumps(data, indent=2 if indent else None))
+    os.replace(tmp, path)
+
+
+def fingerprint(data, ignore: tuple = ()) -> str:
+    """Stable hash of data (skipping top-level keys in ignore) - cheap "did it change?" check."""
+    if isinstance(data, dict) and ignore:
+        data = {k: v for k, v in data.items() if k not in ignore}
+    raw = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
@@ -5,6 +5,7 @@ Fallback: local Ollama
 """
 
 import os
+import re
 import requests
 import logging
 from pathlib import Path
@@ -31,11 +32,24 @@ MODEL_FAST = "mistral:latest"    # For quick tasks
 # Default model
 NODUX_MODEL = MODEL_REPLY
 
+# How long Ollama keeps a model loaded after a call. Keeping it resident lets
+# repeated calls with the same system prompt reuse the cached prompt prefix.
+KEEP_ALIVE = os.environ.get("LLM_KEEP_ALIVE", "30m")
+
 # Timeout settings (70b needs more time)
 TIMEOUT_DEFAULT = 120  # seconds
 TIMEOUT_70B = 300      # 5 min for big model
 
 
+# Leading/trailing whitespace and quotes (incl. the smart quotes models like to emit)
+_QUOTE_STRIP_RE = re.compile(r'^[\s"\'“”‘’]+|[\s"\'“”‘’]+$')
+
+
+def strip_quotes(text: str) -> str:
+    """Strip surrounding whitespace and quote characters from an LLM response in one pass."""
+    return _QUOTE_STRIP_RE.sub("", text)
+
+
 def _get_timeout(model: str) -> int:
     """Get appropriate timeout for model size."""
     if model and "70b" in model.lower():
@@ -115,7 +129,8 @@ def _call_ollama(base_url: str, model: str, prompt: str, system: str = None, tim
     payload = {
         "model": model,
         "prompt": prompt,
-        "stream": False
+        "stream": False,
+        "keep_alive": KEEP_ALIVE
     }
     if system:
         payload["system"] = system
@@ -136,7 +151,8 @@ def _call_chat(base_url: str, model: str, messages: list, timeout: int = TIMEOUT
     payload = {
         "model": model,
         "messages": messages,
-        "stream": False
+        "stream": False,
+        "keep_alive": KEEP_ALIVE
     }
 
     resp = requests.post(
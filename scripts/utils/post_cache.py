@@ -0,0 +1,72 @@
+"""
+Generated-post cache - skip LLM calls when the context hasn't meaningfully changed.
+
+Keys are built from a normalized view of the context (sorted hashtags/agents,
+bucketed numbers) so near-identical contexts collide. Only posts that were
+generated but never published are kept: once a post goes out it is consumed,
+so the cache never causes the same content to be posted twice.
+"""
+
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+from utils.jsonio import load_json, save_json
+
+MOLTX_DIR = Path(__file__).parent.parent.parent
+CACHE_FILE = MOLTX_DIR / "config" / "post_cache.json"
+
+# Cached generations go stale with the network state they were written for
+TTL_SECONDS = 30 * 60
+
+# Callers may generate from worker threads; serialize read-modify-write of the file
+_lock = threading.Lock()
+
+
+def context_key(**parts) -> str:
+    """Build a stable key from context parts (lists/sets are order-insensitive)."""
+    normalized = {
+        k: sorted(v) if isinstance(v, (list, set, tuple, frozenset)) else v
+        for k, v in parts.items()
+    }
+    raw = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _load() -> dict:
+    try:
+        return load_json(CACHE_FILE)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(cache: dict):
+    now = time.time()
+    cache = {k: v for k, v in cache.items() if v.get("created_at", 0) + TTL_SECONDS >= now}
+    save_json(CACHE_FILE, cache)
+
+
+def get_cached_post(namespace: str, key: str) -> str | None:
+    """Return an unpublished post generated for this context, if still fresh."""
+    entry = _load().get(f"{namespace}:{key}")
+    if entry and entry.get("created_at", 0) + TTL_SECONDS >= time.time():
+        return entry.get("post")
+    return None
+
+
+def cache_post(namespace: str, key: str, post: str):
+    """Remember a freshly generated (not yet published) post."""
+    with _lock:
+        cache = _load()
+        cache[f"{namespace}:{key}"] = {"post": post, "created_at": time.time()}
+        _save(cache)
+
+
+def consume_cached_post(namespace: str, key: str):
+    """Drop a cached post once it has been published."""
+    with _lock:
+        cache = _load()
+        if cache.pop(f"{namespace}:{key}", None) is not None:
+            _save(cache)
@@ -0,0 +1,98 @@
+"""
+Proactive rate limiter driven by MoltX rate limit headers.
+
+The API reports its budget on responses:
+- X-RateLimit-Remaining: Remaining requests
+- X-RateLimit-Reset: Unix timestamp when limit resets
+
+Requests go straight through while budget is left; once remaining drops to
+the reserve, acquire() blocks until the reset instead of burning into 429s.
+
+TokenBucket is the client-side counterpart for callers without header
+feedback: a steady request rate with room for short bursts.
+"""
+
+import time
+import random
+import threading
+
+
+class RateLimiter:
+    """Thread-safe limiter fed from response headers."""
+
+    def __init__(self, reserve: int = 2):
+        self.reserve = reserve      # Stop this many requests short of the limit
+        self.remaining = None       # Unknown until the first response
+        self.reset_at = 0.0         # Unix time the budget refills
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait (only if needed) before sending a request."""
+        with self._lock:
+            now = time.time()
+            if self.reset_at and now >= self.reset_at:
+                # Window rolled over - budget unknown until the next response
+                self.remaining = None
+                self.reset_at = 0.0
+            wait = 0.0
+            if self.remaining is not None:
+                if self.remaining <= self.reserve:
+                    wait = self.reset_at - now
+                self.remaining -= 1
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, response):
+        """Record the budget reported by a response."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        with self._lock:
+            try:
+                if remaining is not None:
+                    self.remaining = int(remaining)
+                if reset is not None:
+                    reset = float(reset)
+                    self.reset_at = reset / 1000 if reset > 1e12 else reset  # Tolerate ms timestamps
+            except ValueError:
+                pass
+
+    def block_until(self, timestamp: float):
+        """Hold every caller until timestamp (e.g. after a 429)."""
+        with self._lock:
+            self.remaining = 0
+            self.reset_at = max(self.reset_at, timestamp)
+
+    def retry_delay(self, response, attempt: int) -> float:
+        """Seconds to wait before retrying a 429: Retry-After, else the reset, else backoff (+ jitter)."""
+        jitter = random.random() * 0.5
+        retry_after = response.headers.get("Retry-After")
+        try:
+            if retry_after is not None:
+                return float(retry_after) + jitter
+        except ValueError:
+            pass
+        if self.reset_at > time.time():
+            return self.reset_at - time.time() + jitter
+        return min(2 ** attempt, 60) + jitter
+
+
+class TokenBucket:
+    """Thread-safe token bucket: a steady `rate` requests/sec with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping only until one has refilled."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1  # May go negative: that reserves the next refill for this caller
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
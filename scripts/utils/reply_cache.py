@@ -0,0 +1,106 @@
+"""
+DM reply cache - reuse the reply we generated for an identical message.
+
+DMs are heavy-tailed ("gm", "hey", "lol"), so the same sender often sends
+the same text again within a day. Keyed by sender + normalized content,
+persisted to config/reply_cache.json for REPLY_TTL.
+
+Hit/miss counts are kept with the entries; if memoizing stops paying off
+(hit rate under MIN_HIT_RATE) only every PROBE_EVERY-th new reply is stored,
+so hits can still happen and the rate can climb back once traffic repeats.
+"""
+
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+from utils.jsonio import load_json, save_json
+
+MOLTX_DIR = Path(__file__).parent.parent.parent
+REPLY_CACHE_FILE = MOLTX_DIR / "config" / "reply_cache.json"
+
+REPLY_TTL = 24 * 3600
+MAX_ENTRIES = 512
+MIN_HIT_RATE = 0.05
+MIN_LOOKUPS = 100      # Don't judge the hit rate before this many lookups
+DECAY_LOOKUPS = 1000   # Halve the counts past this so the rate tracks recent traffic
+PROBE_EVERY = 10       # While storing is throttled, still store one reply in this many
+
+_cache = None
+_dirty = False        # Entries changed - always worth writing
+_stats_dirty = False  # Only the hit/miss counts changed - written while storing is on
+_lock = threading.Lock()
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        try:
+            _cache = load_json(REPLY_CACHE_FILE)
+        except (OSError, ValueError):
+            _cache = {}
+        _cache.setdefault("replies", {})
+        _cache.setdefault("stats", {"hits": 0, "misses": 0})
+        _cache["stats"].setdefault("skipped", 0)
+    return _cache
+
+
+def _storing(stats: dict) -> bool:
+    lookups = stats["hits"] + stats["misses"]
+    return lookups < MIN_LOOKUPS or stats["hits"] >= MIN_HIT_RATE * lookups
+
+
+def _key(sender: str, content: str) -> str:
+    return hashlib.sha1(f"{sender}|{content.strip().lower()}".encode()).hexdigest()
+
+
+def _count(stats: dict, field: str):
+    stats[field] += 1
+    if stats["hits"] + stats["misses"] > DECAY_LOOKUPS:
+        stats["hits"] //= 2
+        stats["misses"] //= 2
+
+
+def get_cached_reply(sender: str, content: str) -> str | None:
+    """Reply generated for this exact message from sender in the last REPLY_TTL, if any."""
+    global _stats_dirty
+    with _lock:
+        cache = _load()
+        entry = cache["replies"].get(_key(sender, content))
+        hit = entry is not None and entry["created_at"] + REPLY_TTL >= time.time()
+        _count(cache["stats"], "hits" if hit else "misses")
+        _stats_dirty = True
+        return entry["reply"] if hit else None
+
+
+def cache_reply(sender: str, content: str, reply: str):
+    """Remember a freshly generated reply (only every PROBE_EVERY-th while the hit rate is too low)."""
+    global _dirty
+    with _lock:
+        cache = _load()
+        stats = cache["stats"]
+        if not _storing(stats):
+            stats["skipped"] += 1
+            if stats["skipped"] < PROBE_EVERY:
+                return
+            stats["skipped"] = 0
+        cache["replies"][_key(sender, content)] = {"reply": reply, "created_at": time.time()}
+        _dirty = True
+
+
+def flush_reply_cache():
+    """Drop expired entries (and the oldest past MAX_ENTRIES) and write the cache if it changed."""
+    global _dirty, _stats_dirty
+    with _lock:
+        if not _dirty and not (_stats_dirty and _storing(_load()["stats"])):
+            return
+        cache = _load()
+        cutoff = time.time() - REPLY_TTL
+        fresh = sorted(
+            ((k, v) for k, v in cache["replies"].items() if v["created_at"] >= cutoff),
+            key=lambda kv: kv[1]["created_at"]
+        )
+        cache["replies"] = dict(fresh[-MAX_ENTRIES:])
+        save_json(REPLY_CACHE_FILE, cache, indent=False)
+        _dirty = _stats_dirty = False
@@ -0,0 +1,99 @@
+"""Smoke tests for the intel dashboard against a throwaway database."""
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask")
+
+AGENTS_DIR = Path(__file__).parent.parent / "scripts" / "agents"
+sys.path.insert(0, str(AGENTS_DIR.parent))
+sys.path.insert(0, str(AGENTS_DIR))
+
+import intel_database  # noqa: E402
+import intel_dashboard  # noqa: E402
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_file = tmp_path / "intel.db"
+    monkeypatch.setattr(intel_database, "DB_FILE", db_file)
+    monkeypatch.setattr(intel_dashboard, "DB_FILE", db_file)
+    intel_database.init_database()
+    conn = intel_database.get_connection()
+    conn.execute(
+        "INSERT INTO agents (name, avatar_emoji, last_seen, current_followers) VALUES (?, ?, ?, ?)",
+        ("O'Brien", "🦀", "2026-01-02T00:00:00", 42),
+    )
+    conn.commit()
+    conn.close()
+    intel_dashboard._page_cache.clear()
+    intel_dashboard._page_queries.clear()
+    return intel_dashboard.app.test_client()
+
+
+def test_dashboard_streams_full_page(client):
+    r = client.get("/")
+    assert r.status_code == 200
+    body = r.get_data(as_text=True)
+    assert "Intel Dashboard" in body
+    assert "O&#39;Brien" in body or "O\\u0027Brien" in body
+    assert body.rstrip().endswith("</html>")
+    assert r.headers["ETag"]
+
+
+def test_dashboard_revalidates_and_reuses_render(client):
+    first = client.get("/")
+    etag = first.headers["ETag"].strip('"')
+    assert client.get("/", headers={"If-None-Match": f'"{etag}"'}).status_code == 304
+    again = client.get("/")
+    assert again.get_data(as_text=True) == first.get_data(as_text=True)
+
+
+def test_overlapping_requests_share_queries(client, monkeypatch):
+    calls = []
+    real_get_stats = intel_dashboard.get_stats
+    monkeypatch.setattr(intel_dashboard, "get_stats", lambda *a, **kw: calls.append(1) or real_get_stats(*a, **kw))
+    first = client.get("/")   # Still streaming (body not read yet)...
+    second = client.get("/")  # ...so this one joins its queries
+    # Read the inner stream first - both request contexts live on this one test thread
+    assert second.get_data() == first.get_data()
+    assert len(calls) == 1
+
+
+def test_versioned_static_assets_are_immutable(client):
+    version = intel_dashboard.ASSET_VERSIONS["dashboard.js"]
+    r = client.get(f"/static/dashboard.js?v={version}")
+    assert r.status_code == 200
+    assert "no-cache" not in r.headers["Cache-Control"]
+    assert "immutable" in r.headers["Cache-Control"]
+    r.close()
+
+
+def _add_agents(*rows):
+    conn = intel_database.get_connection()
+    conn.executemany("INSERT INTO agents (name, current_followers) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def test_api_agents_sorted_page(client):
+    _add_agents(("carol", 7), ("alice", 9), ("bob", 8))
+    r = client.get("/api/agents?sort=name&order=asc&limit=2&offset=1")
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["total"] == 4
+    assert [row[0] for row in data["rows"]] == ["alice", "bob"]
+
+
+def test_api_agents_filter_matches_wildcards_literally(client):
+    _add_agents(("a_b", 1), ("axb", 2), ("50%", 3), ("500", 4))
+    names = lambda q: sorted(row[0] for row in client.get("/api/agents", query_string={"q": q}).get_json()["rows"])
+    assert names("_") == ["a_b"]
+    assert names("%") == ["50%"]
+
+
+def test_api_agents_rejects_unknown_sort_column(client):
+    r = client.get("/api/agents?sort=name;DROP TABLE agents")
+    assert r.status_code == 400
+    assert "Unsortable column" in r.get_json()["error"]